@@ -0,0 +1,372 @@
+"""Benchmarks for the conversion, calendar, clock and history hot paths.
+
+Runs every benchmark in a scratch working directory with an offscreen Qt
+platform and writes the timings as JSON, one file per commit, so two runs
+can be compared:
+
+    python benchmarks/hot_paths.py
+    python benchmarks/hot_paths.py --compare benchmarks/results/BASE.json benchmarks/results/HEAD.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+sys.path.insert(0, ROOT)
+
+BENCHMARKS = []
+
+# Cold start runs in a fresh interpreter so nothing is imported or cached yet.
+STARTUP_SCRIPT = """
+import json, sys
+sys.argv = ['calendar_clock_app.py']
+import calendar_clock_app
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+window = calendar_clock_app.CalendarClockApp()
+window.show()
+app.processEvents()
+window.mark_startup('show')
+print(json.dumps(window.startup_timings))
+"""
+
+
+def benchmark(function):
+    BENCHMARKS.append(function)
+    return function
+
+
+def measure(function, number=1, repeat=5, setup=None):
+    """Run `function` `number` times per sample and return per-call timing statistics."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - started) / number)
+    return {
+        'mean': statistics.fmean(samples),
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'number': number,
+        'repeat': repeat
+    }
+
+
+class Context:
+    def __init__(self, quick=False):
+        self.quick = quick
+        self.app = None
+        self.window = None
+
+    def qt_app(self):
+        if self.app is None:
+            from PyQt6.QtWidgets import QApplication
+            self.app = QApplication.instance() or QApplication([sys.argv[0]])
+        return self.app
+
+    def main_window(self):
+        if self.window is None:
+            self.qt_app()
+            import calendar_clock_app
+            self.window = calendar_clock_app.CalendarClockApp()
+            self.window.timer.stop()
+            self.window.show()
+            self.app.processEvents()
+        return self.window
+
+    def fresh_window(self):
+        if self.window is not None:
+            self.window.close()
+            self.window.deleteLater()
+            self.app.processEvents()
+            self.window = None
+        return self.main_window()
+
+    def show_tab(self, name):
+        window = self.main_window()
+        window.tabs.setCurrentIndex(window.tab_names.index(name))
+        self.app.processEvents()
+        return window
+
+
+@benchmark
+def scalar_conversions(ctx):
+    import calendar_engine
+    days = [date.fromordinal(o) for o in range(date(1990, 1, 1).toordinal(), date(2030, 1, 1).toordinal(), 7)]
+    jalali = [calendar_engine.gregorian_to_jalali(d.year, d.month, d.day) for d in days]
+    hijri = [calendar_engine.gregorian_to_hijri(d.year, d.month, d.day) for d in days]
+    number = len(days)
+
+    def run(convert, dates):
+        items = iter(dates * 10)
+        return lambda: convert(*next(items))
+
+    yield 'scalar.gregorian_to_jalali', measure(
+        run(calendar_engine.gregorian_to_jalali, [(d.year, d.month, d.day) for d in days]), number)
+    yield 'scalar.gregorian_to_hijri', measure(
+        run(calendar_engine.gregorian_to_hijri, [(d.year, d.month, d.day) for d in days]), number)
+    yield 'scalar.jalali_to_gregorian', measure(run(calendar_engine.jalali_to_gregorian, jalali), number)
+    yield 'scalar.hijri_to_gregorian', measure(run(calendar_engine.hijri_to_gregorian, hijri), number)
+
+
+@benchmark
+def batch_conversions(ctx):
+    import calendar_engine
+    calendar_engine._require_numpy()
+    np = calendar_engine.np
+    size = 10000 if ctx.quick else 100000
+    ordinals = np.arange(date(1925, 1, 1).toordinal(), date(2125, 1, 1).toordinal())
+    ordinals = ordinals[np.linspace(0, len(ordinals) - 1, size).astype(np.int64)]
+    gy, gm, gd = calendar_engine.ordinal_to_gregorian_batch(ordinals)
+    jy, jm, jd = calendar_engine.gregorian_to_jalali_batch(gy, gm, gd)
+    hy, hm, hd = calendar_engine.gregorian_to_hijri_batch(gy, gm, gd)
+    table = calendar_engine.month_table('jalali')
+    tjy, tjm, tjd = table.locate_batch(ordinals)
+    for name, function in [
+        ('batch.gregorian_to_jalali', lambda: calendar_engine.gregorian_to_jalali_batch(gy, gm, gd)),
+        ('batch.gregorian_to_hijri', lambda: calendar_engine.gregorian_to_hijri_batch(gy, gm, gd)),
+        ('batch.jalali_to_gregorian', lambda: calendar_engine.jalali_to_gregorian_batch(jy, jm, jd)),
+        ('batch.hijri_to_gregorian', lambda: calendar_engine.hijri_to_gregorian_batch(hy, hm, hd)),
+        ('batch.jalali_table_locate', lambda: table.locate_batch(ordinals)),
+        ('batch.jalali_table_to_ordinal', lambda: table.to_ordinal_batch(tjy, tjm, tjd))
+    ]:
+        result = measure(function)
+        result['rows'] = size
+        yield name, result
+
+
+@benchmark
+def calendar_navigation(ctx):
+    window = ctx.show_tab('calendar')
+    navigations = 100 if ctx.quick else 1000
+    year = window.current_year
+
+    def navigate():
+        for step in range(navigations):
+            # Signals are blocked so the debounced refresh does not fire on top
+            # of the direct call being measured.
+            window.month_combo.blockSignals(True)
+            window.year_input.blockSignals(True)
+            window.month_combo.setCurrentIndex(step % 12)
+            window.year_input.setText(str(year + step // 12))
+            window.month_combo.blockSignals(False)
+            window.year_input.blockSignals(False)
+            window.update_calendar()
+        ctx.app.processEvents()
+
+    result = measure(navigate, repeat=3)
+    result['navigations'] = navigations
+    yield 'update_calendar.navigations', result
+
+
+@benchmark
+def clock_paint(ctx):
+    ctx.qt_app()
+    from calendar_clock_app import ClockWidget
+    now = datetime.now()
+    for size in (200, 400, 800):
+        widget = ClockWidget()
+        widget.resize(size, size)
+        widget.update_time(now)
+        widget.show()
+        ctx.app.processEvents()
+        widget.repaint()
+        yield f'clock_widget.paint.{size}px', measure(widget.repaint, 50 if ctx.quick else 200)
+        ticks = iter(range(1, 100000))
+
+        def tick():
+            # A one-second step, repainted the way the timer does it.
+            widget.update_time(now + timedelta(seconds=next(ticks)))
+            ctx.app.processEvents()
+
+        yield f'clock_widget.tick.{size}px', measure(tick, 50 if ctx.quick else 200)
+        widget.close()
+        widget.deleteLater()
+    ctx.app.processEvents()
+
+
+@benchmark
+def clock_updates(ctx):
+    import pytz
+    zones = [zone for zone in pytz.common_timezones if zone != 'UTC']
+    for count in (1, 50, 500):
+        window = ctx.fresh_window()
+        ctx.show_tab('clock')
+        board = window.clock_board
+        for zone in zones:
+            if len(board.zones) >= count:
+                break
+            board.add_zone(zone)
+        window.update_clocks_ui()
+        ctx.app.processEvents()
+
+        def tick():
+            window.update_clocks()
+            ctx.app.processEvents()
+
+        result = measure(tick, 5 if count == 500 else 20)
+        result['zones'] = len(board.zones)
+        yield f'update_clocks.{count}_zones', result
+
+
+@benchmark
+def history_writes(ctx):
+    for existing in (0, 1000, 10000):
+        window = ctx.fresh_window()
+        ctx.show_tab('clock')
+        window.history_store.clear()
+        zone = window.clock_board.zones[0]
+        entry = {'time': '12:00:00', 'timezone': zone, 'date': '2024-01-01 12:00:00', 'action': 'Updated'}
+        window.history_store.append([entry] * existing)
+        window.history_store.sync()
+
+        def add_and_save():
+            window.add_to_history(zone)
+            window.history_store.sync()
+
+        yield f'history.add_and_save.{existing}_existing', measure(add_and_save, 50)
+
+
+@benchmark
+def history_table(ctx):
+    rows = 1000 if ctx.quick else 10000
+    window = ctx.fresh_window()
+    window.history_store.clear()
+    entry = {'time': '12:00:00', 'timezone': 'UTC', 'date': '2024-01-01 12:00:00', 'action': 'Updated'}
+    window.history_store.append([entry] * rows)
+    window.history_store.sync()
+    ctx.show_tab('history')
+    window.history_model.clear()
+    window.history_model.append_entries([entry] * rows)
+    ctx.app.processEvents()
+
+    def refresh():
+        window.update_history_ui()
+        ctx.app.processEvents()
+
+    result = measure(refresh, 20)
+    result['rows'] = window.history_model.rowCount()
+    yield 'update_history_ui.rows', result
+
+
+@benchmark
+def cold_start(ctx):
+    samples = []
+    phases = {}
+    for _ in range(2 if ctx.quick else 5):
+        started = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], cwd=os.getcwd(), check=True,
+                                capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=ROOT)).stdout
+        samples.append(time.perf_counter() - started)
+        for phase, seconds in json.loads(output.strip().splitlines()[-1]).items():
+            phases.setdefault(phase, []).append(seconds)
+    yield 'startup.cold_process', {
+        'mean': statistics.fmean(samples),
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'number': 1,
+        'repeat': len(samples),
+        'phases': {phase: statistics.median(values) for phase, values in phases.items()}
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_benchmarks(args):
+    from PyQt6.QtCore import QT_VERSION_STR
+    results = {}
+    ctx = Context(quick=args.quick)
+    original = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='calendar-clock-bench-') as workdir:
+        # The app reads and writes its history and cache files in the
+        # working directory; keep the benchmark away from the real ones.
+        os.chdir(workdir)
+        try:
+            for function in BENCHMARKS:
+                if args.filter and not any(part in function.__name__ for part in args.filter):
+                    continue
+                for name, result in function(ctx):
+                    results[name] = result
+                    print(f"{name:45s} {result['median'] * 1000:12.4f} ms", file=sys.stderr)
+            if ctx.window is not None:
+                ctx.window.close()
+        finally:
+            os.chdir(original)
+    return {
+        'commit': git_commit(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'qt': QT_VERSION_STR,
+        'platform': platform.platform(),
+        'qt_platform': os.environ.get('QT_QPA_PLATFORM'),
+        'quick': args.quick,
+        'benchmarks': results
+    }
+
+
+def compare(base_path, head_path, threshold):
+    with open(base_path, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(head_path, encoding='utf-8') as f:
+        head = json.load(f)
+    regressions = 0
+    print(f"{'benchmark':45s} {base['commit']:>12s} {head['commit']:>12s}   ratio")
+    for name, result in head['benchmarks'].items():
+        if name not in base['benchmarks']:
+            continue
+        before = base['benchmarks'][name]['median']
+        after = result['median']
+        ratio = after / before if before else float('inf')
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  slower'
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = '  faster'
+        print(f"{name:45s} {before * 1000:10.3f}ms {after * 1000:10.3f}ms {ratio:7.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', help="Result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--filter', action='append', help="Only run benchmarks whose name contains this text")
+    parser.add_argument('--quick', action='store_true', help="Smaller inputs for a fast smoke run")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'), help="Compare two result files and exit")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Ratio change reported as slower/faster")
+    args = parser.parse_args()
+    if args.compare:
+        regressions = compare(*args.compare, args.threshold)
+        sys.exit(1 if regressions else 0)
+    result = run_benchmarks(args)
+    output = args.output or os.path.join(RESULTS_DIR, f"{result['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=4)
+        f.write('\n')
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""Load test for ``calendar_clock_app.py --serve``.
+
+Starts the server in a subprocess pinned to one CPU core, opens many
+WebSocket clients against it and counts the ticks each client receives.
+
+    python benchmarks/ws_load.py --clients 5000 --seconds 10
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from clock_server import read_frame  # noqa: E402
+
+
+def raise_file_limit(needed):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = hard if hard != resource.RLIM_INFINITY else max(soft, needed)
+    if soft < target:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    return target
+
+
+def process_cpu_seconds(pid):
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def wait_for_port(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def connect(host, port, stats):
+    """Open a WebSocket to /ws; returns (reader, writer) or None on failure."""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        writer.write(f"GET /ws HTTP/1.1\r\nHost: {host}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                     f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode('ascii'))
+        response = await reader.readuntil(b'\r\n\r\n')
+        if not response.startswith(b'HTTP/1.1 101'):
+            stats['failed'] += 1
+            writer.close()
+            return None
+    except (OSError, asyncio.IncompleteReadError):
+        stats['failed'] += 1
+        return None
+    stats['connected'] += 1
+    return reader, writer
+
+
+async def listen(reader, writer, stop, stats, latencies):
+    received = 0
+    try:
+        while not stop.is_set():
+            opcode, payload = await read_frame(reader)
+            if opcode == 0x1:
+                received += 1
+                latencies.append(time.time() - json.loads(payload)['instant'])
+    except (OSError, asyncio.IncompleteReadError, ValueError):
+        stats['dropped'] += 1
+    finally:
+        stats['messages'].append(received)
+        writer.close()
+
+
+async def run(args):
+    env = dict(os.environ)
+    command = [sys.executable, os.path.join(ROOT, 'calendar_clock_app.py'), '--serve',
+               '--port', str(args.port), '--zones', args.zones]
+    server = subprocess.Popen(command, cwd=args.workdir, env=env, stderr=subprocess.DEVNULL,
+                              preexec_fn=(lambda: os.sched_setaffinity(0, {args.core}))
+                              if hasattr(os, 'sched_setaffinity') else None)
+    try:
+        await wait_for_port(args.host, args.port)
+        stats = {'connected': 0, 'failed': 0, 'dropped': 0, 'messages': []}
+        latencies = []
+        stop = asyncio.Event()
+        gate = asyncio.Semaphore(args.connect_concurrency)
+
+        async def gated_client():
+            # The gate covers the connect and handshake only; once upgraded
+            # the client frees its slot for the next one.
+            async with gate:
+                connection = await connect(args.host, args.port, stats)
+            if connection is not None:
+                await listen(*connection, stop, stats, latencies)
+
+        started = time.monotonic()
+        tasks = [asyncio.create_task(gated_client()) for _ in range(args.clients)]
+        while stats['connected'] + stats['failed'] < args.clients and time.monotonic() - started < 60:
+            await asyncio.sleep(0.1)
+        connect_seconds = time.monotonic() - started
+        del latencies[:]
+        cpu_before = process_cpu_seconds(server.pid)
+        measure_started = time.monotonic()
+        await asyncio.sleep(args.seconds)
+        measured = time.monotonic() - measure_started
+        cpu_after = process_cpu_seconds(server.pid)
+        stop.set()
+        server.terminate()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        if server.poll() is None:
+            server.kill()
+        server.wait()
+    messages = stats['messages']
+    return {
+        'clients': args.clients,
+        'connected': stats['connected'],
+        'failed': stats['failed'],
+        'connect_seconds': round(connect_seconds, 3),
+        'measured_seconds': round(measured, 3),
+        'ticks_per_client_min': min(messages) if messages else 0,
+        'ticks_per_client_mean': round(sum(messages) / len(messages), 2) if messages else 0,
+        'latency_ms_p50': round(percentile(latencies, 0.5) * 1000, 2) if latencies else None,
+        'latency_ms_p99': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        'server_cpu_percent': round((cpu_after - cpu_before) / measured * 100, 1)
+        if cpu_before is not None and cpu_after is not None else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=2000)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8799)
+    parser.add_argument('--zones', default='Asia/Tehran,Europe/London,America/New_York,Asia/Tokyo')
+    parser.add_argument('--core', type=int, default=0, help="CPU core the server is pinned to")
+    parser.add_argument('--connect-concurrency', type=int, default=256)
+    parser.add_argument('--workdir', default=os.getcwd())
+    parser.add_argument('--output', help="Also write the result as JSON to this file")
+    args = parser.parse_args()
+    raise_file_limit(args.clients * 2 + 64)
+    result = asyncio.run(run(args))
+    text = json.dumps(result, indent=4)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,34 +1,137 @@
+import time
+STARTUP_STARTED = time.perf_counter()
+import os
 import sys
+if __name__ == '__main__' and '--serve' in sys.argv[1:]:
+    # Headless mode: hand over before PyQt6 is imported.
+    from clock_server import main
+    sys.exit(main(sys.argv[1:]))
+if __name__ == '__main__' and '--convert' in sys.argv[1:]:
+    from date_convert import main
+    sys.exit(main(sys.argv[1:]))
+import json
 import math
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, timedelta, MAXYEAR
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QComboBox,
     QPushButton, QTextEdit, QLabel, QStyleFactory, QTabWidget, QGridLayout,
-    QScrollArea, QMenuBar, QMenu, QFileDialog, QMessageBox, QLineEdit, QListWidget, QListWidgetItem
+    QMenuBar, QMenu, QFileDialog, QMessageBox, QLineEdit, QListWidget, QListWidgetItem,
+    QTableView, QHeaderView, QAbstractItemView, QCompleter, QCheckBox, QPlainTextEdit
 )
-from PyQt6.QtCore import Qt, QTimer, QRectF
-from PyQt6.QtGui import QIcon, QPalette, QColor, QFont, QPainter, QPen, QBrush
-import json
+from PyQt6.QtCore import Qt, QEvent, QTimer, QPoint, QRect, QRectF, QAbstractTableModel, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QIcon, QPalette, QColor, QFont, QPainter, QPen, QBrush, QIntValidator, QPixmap, QRegion
 from pathlib import Path
-import pytz
-import calendar
+import calendar_engine
+from history_store import HistoryStore
+from holiday_engine import load_holiday_index
+from month_grid import WEEK_START, MonthGrids
+from theme_engine import ThemeCompiler
+from i18n import load_catalog
+from instrumentation import profiler, rss_bytes
+IMPORTS_FINISHED = time.perf_counter()
 
 class ClockWidget(QWidget):
-    def __init__(self, timezone, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumSize(200, 200)
-        self.timezone = pytz.timezone(timezone)
-
-    def set_timezone(self, timezone):
-        self.timezone = pytz.timezone(timezone)
-        self.update()
+        self.theme_name = None
+        self.current_time = None
+        self.show_seconds = True
+        self.hands = None
+        self.hands_area = None
+        self.hand_pens = (QPen(QColor(0, 0, 255), 5), QPen(QColor(255, 0, 0), 3), QPen(QColor(0, 0, 0), 2))
+        self.face_cache = None
+        self.face_cache_key = None
+
+    def set_theme(self, theme_name):
+        if theme_name != self.theme_name:
+            self.theme_name = theme_name
+            self.face_cache = None
+            self.update()
+
+    def set_show_seconds(self, show_seconds):
+        if show_seconds != self.show_seconds:
+            self.show_seconds = show_seconds
+            self.hands = None
+            self.update()
+
+    def hand_positions(self, current_time):
+        # Everything the hand angles depend on; equal positions paint the
+        # same pixels.
+        second = current_time.second if self.show_seconds else None
+        return current_time.hour % 12, current_time.minute, second
+
+    def update_time(self, current_time):
+        self.current_time = current_time
+        hands = self.hand_positions(current_time)
+        if hands == self.hands:
+            return
+        # Clocks scrolled or clipped out of view are painted with the latest
+        # time when they are exposed again.
+        if self.visibleRegion().isEmpty():
+            self.hands = None
+            return
+        area = self.hands_region(current_time)
+        if self.hands is None or self.hands_area is None:
+            self.update()
+        else:
+            # Only the pixels under the old and the new hands change; the
+            # rest of the face is left as it is on screen.
+            self.update(area.united(self.hands_area))
+        self.hands = hands
+        self.hands_area = area
 
-    def update_time(self):
-        self.update()
+    def hand_lines(self, current_time):
+        size = min(self.width(), self.height())
+        center = self.rect().center()
+        radius = size // 2 - 15
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        second = current_time.second if self.show_seconds else 0
+        hour = current_time.hour % 12 + current_time.minute / 60.0
+        minute = current_time.minute + second / 60.0
+        hands = [(hour * 30, radius - 40), (minute * 6, radius - 25)]
+        if self.show_seconds:
+            hands.append((second * 6, radius - 15))
+
+        lines = []
+        for (degrees, length), pen in zip(hands, self.hand_pens):
+            angle = (degrees - 90) * math.pi / 180
+            end = QPoint(int(center.x() + length * math.cos(angle)), int(center.y() + length * math.sin(angle)))
+            lines.append((pen, end))
+        return center, lines
+
+    def hands_region(self, current_time):
+        center, lines = self.hand_lines(current_time)
+        area = QRegion()
+        for pen, end in lines:
+            # The square cap reaches half the pen width past the end point in
+            # both directions, plus a pixel of antialiasing.
+            margin = pen.width() + 1
+            area = area.united(QRect(center, end).normalized().adjusted(-margin, -margin, margin, margin))
+        return area
+
+    def resizeEvent(self, event):
+        self.face_cache = None
+        self.hands = None
+        self.hands_area = None
+        super().resizeEvent(event)
+
+    def face_pixmap(self):
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr, self.theme_name)
+        if self.face_cache is None or self.face_cache_key != key:
+            pixmap = QPixmap(max(1, round(self.width() * dpr)), max(1, round(self.height() * dpr)))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            self.paint_face(painter)
+            painter.end()
+            self.face_cache = pixmap
+            self.face_cache_key = key
+        return self.face_cache
+
+    def paint_face(self, painter):
         size = min(self.width(), self.height())
         center = self.rect().center()
         radius = size // 2 - 15
@@ -53,32 +156,122 @@ class ClockWidget(QWidget):
                 y2 = center.y() + radius * math.sin(angle)
                 painter.drawLine(int(x1), int(y1), int(x2), int(y2))
 
-        current_time = datetime.now(self.timezone)
-        hour = current_time.hour % 12 + current_time.minute / 60.0
-        minute = current_time.minute + current_time.second / 60.0
-        second = current_time.second
-
-        hour_angle = (hour * 30 - 90) * math.pi / 180
-        hour_x = center.x() + (radius - 40) * math.cos(hour_angle)
-        hour_y = center.y() + (radius - 40) * math.sin(hour_angle)
-        painter.setPen(QPen(QColor(0, 0, 255), 5))
-        painter.drawLine(center.x(), center.y(), int(hour_x), int(hour_y))
-
-        minute_angle = (minute * 6 - 90) * math.pi / 180
-        minute_x = center.x() + (radius - 25) * math.cos(minute_angle)
-        minute_y = center.y() + (radius - 25) * math.sin(minute_angle)
-        painter.setPen(QPen(QColor(255, 0, 0), 3))
-        painter.drawLine(center.x(), center.y(), int(minute_x), int(minute_y))
-
-        second_angle = (second * 6 - 90) * math.pi / 180
-        second_x = center.x() + (radius - 15) * math.cos(second_angle)
-        second_y = center.y() + (radius - 15) * math.sin(second_angle)
-        painter.setPen(QPen(QColor(0, 0, 0), 2))
-        painter.drawLine(center.x(), center.y(), int(second_x), int(second_y))
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        exposed = event.rect()
+        face = self.face_pixmap()
+        dpr = face.devicePixelRatio()
+        painter.drawPixmap(QRectF(exposed), face, QRectF(exposed.x() * dpr, exposed.y() * dpr,
+                                                         exposed.width() * dpr, exposed.height() * dpr))
+        if self.current_time is None:
+            return
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        center, lines = self.hand_lines(self.current_time)
+        for pen, end in lines:
+            painter.setPen(pen)
+            painter.drawLine(center, end)
+
+HISTORY_PAGE_SIZE = 500
+# On exit, a history log past HISTORY_COMPACT_BYTES is compacted down to its
+# newest HISTORY_KEEP_ENTRIES rows.
+HISTORY_COMPACT_BYTES = 32 * 1024 * 1024
+HISTORY_KEEP_ENTRIES = 100000
+# Jalali and Hijri year 1 both begin in 622; the year field starts there so
+# all three calendars have a month to show.
+FIRST_YEAR = 622
+
+
+class HistoryTableModel(QAbstractTableModel):
+    columns = ['time', 'timezone', 'date', 'action']
+
+    def __init__(self, entries, parent=None):
+        super().__init__(parent)
+        self.entries = entries
+        self.headers = list(self.columns)
+        self.alignment = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.entries[index.row()].get(self.columns[index.column()], '')
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return self.alignment
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self.headers[section]
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return self.alignment
+        return None
+
+    def set_headers(self, headers, alignment):
+        self.headers = list(headers)
+        self.alignment = alignment | Qt.AlignmentFlag.AlignVCenter
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, len(self.columns) - 1)
+        if self.entries:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.entries) - 1, len(self.columns) - 1),
+                                  [Qt.ItemDataRole.TextAlignmentRole])
+
+    def prepend_entries(self, entries):
+        if not entries:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(entries) - 1)
+        self.entries[:0] = entries
+        self.endInsertRows()
+
+    def append_entries(self, entries):
+        if not entries:
+            return
+        first = len(self.entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self.entries.extend(entries)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        del self.entries[:]
+        self.endResetModel()
+
+
+class TimezoneSearchModel(QAbstractListModel):
+    # Rows are (zone, description) pairs from TimezoneIndex.search; the popup
+    # shows the description and the completer inserts the bare zone name.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.results = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.results)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.results[index.row()][1]
+        if role == Qt.ItemDataRole.EditRole:
+            return self.results[index.row()][0]
+        return None
+
+    def set_results(self, results):
+        self.beginResetModel()
+        self.results = list(results)
+        self.endResetModel()
+
 
 class CalendarClockApp(QMainWindow):
     def __init__(self):
         super().__init__()
+        self.startup_timings = {'imports': IMPORTS_FINISHED - STARTUP_STARTED}
+        self.startup_mark = time.perf_counter()
         self.setWindowTitle("Calendar & Clock")
         self.setGeometry(100, 100, 1200, 800)
         self.setWindowIcon(QIcon('icon.ico'))
@@ -86,176 +279,24 @@ class CalendarClockApp(QMainWindow):
         self.current_lang = 'en'
         self.current_theme = 'Windows11'
         self.time_format = '24'
-        self.timezones = [self.get_system_timezone()]
+        self.display_precision = 'seconds'
         self.clocks = []
+        self.clock_widgets = {}
+        self.clock_board = None
+        self.clock_snapshot = None
+        self.history_store = HistoryStore()
         self.history = []
+        self.history_start = 0
+        self.history_scrolled = False
         self.current_year = datetime.now().year
         self.current_month = datetime.now().month
+        self.jalali_table = calendar_engine.month_table('jalali', path='calendar_clock_jalali_months.bin')
+        self.hijri_table = calendar_engine.month_table('hijri', path='calendar_clock_hijri_months.bin')
         self.holidays = self.load_holidays()
-        self.load_history()
+        self.month_grids = MonthGrids(self.holidays, {'jalali': self.jalali_table, 'hijri': self.hijri_table})
+        self.rendered_grids = {}
 
-        self.texts = {
-            'en': {
-                'title': 'Calendar & Clock',
-                'country_label': 'Select Country:',
-                'timezone_label': 'Select Timezone:',
-                'add_timezone_btn': 'Add Timezone',
-                'remove_timezone_btn': 'Remove Selected',
-                'format_label': 'Time Format:',
-                'digital_label': 'Digital Clocks:',
-                'analog_label': 'Analog Clocks:',
-                'calendar_label': 'Calendar:',
-                'month_label': 'Month:',
-                'year_label': 'Year:',
-                'history_tab': 'History',
-                'calendar_tab': 'Calendar',
-                'settings_tab': 'Settings',
-                'language_label': 'Language:',
-                'theme_label': 'Theme:',
-                'clear_history': 'Clear History',
-                'status_idle': 'Displaying current time and calendar...',
-                'status_updated': 'Updated: {time}',
-                'status_added': 'Timezone {tz} added',
-                'status_removed': 'Timezone {tz} removed',
-                'history_time': 'Time',
-                'history_timezone': 'Timezone',
-                'history_date': 'Date',
-                'history_action': 'Action',
-                'save_history': 'Save History to File',
-                'apply': 'Apply',
-                'file_menu': 'File',
-                'exit_action': 'Exit',
-                'about': 'About',
-                'about_text': 'Calendar & Clock\nVersion 1.0\nDeveloped by Hamid Yarali\nGitHub: https://github.com/HamidYaraliOfficial\nInstagram: https://www.instagram.com/hamidyaraliofficial\nTelegram: @Hamid_Yarali',
-                'copy_btn': 'Copy Time',
-                'format_12': '12-Hour',
-                'format_24': '24-Hour',
-                'gregorian': 'Gregorian',
-                'jalali': 'Jalali (Persian)',
-                'hijri': 'Hijri (Islamic)',
-                'calendar_format_label': 'Calendar Format:'
-            },
-            'fa': {
-                'title': 'تقویم و ساعت',
-                'country_label': 'انتخاب کشور:',
-                'timezone_label': 'انتخاب منطقه زمانی:',
-                'add_timezone_btn': 'افزودن منطقه زمانی',
-                'remove_timezone_btn': 'حذف انتخاب‌شده',
-                'format_label': 'فرمت زمان:',
-                'digital_label': 'ساعت‌های دیجیتال:',
-                'analog_label': 'ساعت‌های عقربه‌ای:',
-                'calendar_label': 'تقویم:',
-                'month_label': 'ماه:',
-                'year_label': 'سال:',
-                'history_tab': 'تاریخچه',
-                'calendar_tab': 'تقویم',
-                'settings_tab': 'تنظیمات',
-                'language_label': 'زبان:',
-                'theme_label': 'تم:',
-                'clear_history': 'پاک کردن تاریخچه',
-                'status_idle': 'نمایش زمان و تقویم کنونی...',
-                'status_updated': 'به‌روزرسانی شد: {time}',
-                'status_added': 'منطقه زمانی {tz} اضافه شد',
-                'status_removed': 'منطقه زمانی {tz} حذف شد',
-                'history_time': 'زمان',
-                'history_timezone': 'منطقه زمانی',
-                'history_date': 'تاریخ',
-                'history_action': 'عملیات',
-                'save_history': 'ذخیره تاریخچه در فایل',
-                'apply': 'اعمال',
-                'file_menu': 'فایل',
-                'exit_action': 'خروج',
-                'about': 'درباره',
-                'about_text': 'تقویم و ساعت\nنسخه ۱.۰\nتوسعه‌یافته توسط حمید یارعلی\nگیت‌هاب: https://github.com/HamidYaraliOfficial\nاینستاگرام: https://www.instagram.com/hamidyaraliofficial\nتلگرام: @Hamid_Yarali',
-                'copy_btn': 'کپی زمان',
-                'format_12': '۱۲ ساعته',
-                'format_24': '۲۴ ساعته',
-                'gregorian': 'میلادی',
-                'jalali': 'جلالی (شمسی)',
-                'hijri': 'هجری (قمری)',
-                'calendar_format_label': 'فرمت تقویم:'
-            },
-            'zh': {
-                'title': '日历与时钟',
-                'country_label': '选择国家：',
-                'timezone_label': '选择时区：',
-                'add_timezone_btn': '添加时区',
-                'remove_timezone_btn': '移除选定',
-                'format_label': '时间格式：',
-                'digital_label': '数字时钟：',
-                'analog_label': '模拟时钟：',
-                'calendar_label': '日历：',
-                'month_label': '月份：',
-                'year_label': '年份：',
-                'history_tab': '历史记录',
-                'calendar_tab': '日历',
-                'settings_tab': '设置',
-                'language_label': '语言：',
-                'theme_label': '主题：',
-                'clear_history': '清除历史记录',
-                'status_idle': '显示当前时间和日历...',
-                'status_updated': '已更新：{time}',
-                'status_added': '已添加时区 {tz}',
-                'status_removed': '已移除时区 {tz}',
-                'history_time': '时间',
-                'history_timezone': '时区',
-                'history_date': '日期',
-                'history_action': '操作',
-                'save_history': '将历史记录保存到文件',
-                'apply': '应用',
-                'file_menu': '文件',
-                'exit_action': '退出',
-                'about': '关于',
-                'about_text': '日历与时钟\n版本 1.0\n由 Hamid Yarali 开发\nGitHub: https://github.com/HamidYaraliOfficial\nInstagram: https://www.instagram.com/hamidyaraliofficial\nTelegram: @Hamid_Yarali',
-                'copy_btn': '复制时间',
-                'format_12': '12小时制',
-                'format_24': '24小时制',
-                'gregorian': '公历',
-                'jalali': '波斯历',
-                'hijri': '伊斯兰历',
-                'calendar_format_label': '日历格式：'
-            },
-            'ru': {
-                'title': 'Календарь и часы',
-                'country_label': 'Выберите страну:',
-                'timezone_label': 'Выберите часовой пояс:',
-                'add_timezone_btn': 'Добавить часовой пояс',
-                'remove_timezone_btn': 'Удалить выбранный',
-                'format_label': 'Формат времени:',
-                'digital_label': 'Цифровые часы:',
-                'analog_label': 'Аналоговые часы:',
-                'calendar_label': 'Календарь:',
-                'month_label': 'Месяц:',
-                'year_label': 'Год:',
-                'history_tab': 'История',
-                'calendar_tab': 'Календарь',
-                'settings_tab': 'Настройки',
-                'language_label': 'Язык:',
-                'theme_label': 'Тема:',
-                'clear_history': 'Очистить историю',
-                'status_idle': 'Отображение текущего времени и календаря...',
-                'status_updated': 'Обновлено: {time}',
-                'status_added': 'Часовой пояс {tz} добавлен',
-                'status_removed': 'Часовой пояс {tz} удален',
-                'history_time': 'Время',
-                'history_timezone': 'Часовой пояс',
-                'history_date': 'Дата',
-                'history_action': 'Действие',
-                'save_history': 'Сохранить историю в файл',
-                'apply': 'Применить',
-                'file_menu': 'Файл',
-                'exit_action': 'Выход',
-                'about': 'О программе',
-                'about_text': 'Календарь и часы\nВерсия 1.0\nРазработано Hamid Yarali\nGitHub: https://github.com/HamidYaraliOfficial\nInstagram: https://www.instagram.com/hamidyaraliofficial\nTelegram: @Hamid_Yarali',
-                'copy_btn': 'Копировать время',
-                'format_12': '12-часовой',
-                'format_24': '24-часовой',
-                'gregorian': 'Григорианский',
-                'jalali': 'Джалали (Персидский)',
-                'hijri': 'Хиджри (Исламский)',
-                'calendar_format_label': 'Формат календаря:'
-            }
-        }
+        self.catalog = load_catalog(self.current_lang)
 
         self.themes = {
             'Windows11': {
@@ -267,7 +308,10 @@ class CalendarClockApp(QMainWindow):
                 'accent': QColor(0, 90, 158),
                 'border': QColor(180, 180, 180),
                 'header': QColor(230, 230, 230),
-                'calendar_holiday': QColor(255, 204, 204)
+                'calendar_holiday': QColor(255, 204, 204),
+                'surface': QColor(255, 255, 255),
+                'danger': QColor(200, 0, 0),
+                'digital_text': QColor(0, 0, 255)
             },
             'Dark': {
                 'background': QColor(32, 32, 32),
@@ -278,7 +322,10 @@ class CalendarClockApp(QMainWindow):
                 'accent': QColor(0, 120, 212),
                 'border': QColor(80, 80, 80),
                 'header': QColor(40, 40, 40),
-                'calendar_holiday': QColor(100, 50, 50)
+                'calendar_holiday': QColor(100, 50, 50),
+                'surface': QColor(45, 45, 45),
+                'danger': QColor(200, 0, 0),
+                'digital_text': QColor(100, 170, 255)
             },
             'Light': {
                 'background': QColor(255, 255, 255),
@@ -289,7 +336,10 @@ class CalendarClockApp(QMainWindow):
                 'accent': QColor(0, 120, 212),
                 'border': QColor(200, 200, 200),
                 'header': QColor(245, 245, 245),
-                'calendar_holiday': QColor(255, 204, 204)
+                'calendar_holiday': QColor(255, 204, 204),
+                'surface': QColor(255, 255, 255),
+                'danger': QColor(200, 0, 0),
+                'digital_text': QColor(0, 0, 255)
             },
             'Red': {
                 'background': QColor(255, 235, 235),
@@ -300,7 +350,10 @@ class CalendarClockApp(QMainWindow):
                 'accent': QColor(200, 0, 0),
                 'border': QColor(220, 150, 150),
                 'header': QColor(255, 220, 220),
-                'calendar_holiday': QColor(255, 150, 150)
+                'calendar_holiday': QColor(255, 150, 150),
+                'surface': QColor(255, 245, 245),
+                'danger': QColor(200, 0, 0),
+                'digital_text': QColor(0, 0, 255)
             },
             'Blue': {
                 'background': QColor(235, 245, 255),
@@ -311,202 +364,82 @@ class CalendarClockApp(QMainWindow):
                 'accent': QColor(0, 0, 200),
                 'border': QColor(150, 180, 220),
                 'header': QColor(220, 235, 255),
-                'calendar_holiday': QColor(150, 200, 255)
+                'calendar_holiday': QColor(150, 200, 255),
+                'surface': QColor(245, 250, 255),
+                'danger': QColor(200, 0, 0),
+                'digital_text': QColor(0, 0, 255)
             }
         }
 
+        self.theme_compiler = ThemeCompiler(self.themes)
+        self.style_name = None
+
+        self.mark_startup('state')
+
+        self.init_refresh_scheduler()
+        self.init_tick_scheduler()
+        self.init_midnight_timer()
         self.init_ui()
+        self.mark_startup('ui')
         self.apply_theme(self.current_theme)
+        self.mark_startup('theme')
         self.update_texts()
+        self.mark_startup('texts')
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_clocks)
-        self.timer.start(1000)
+    def mark_startup(self, phase):
+        now = time.perf_counter()
+        self.startup_timings[phase] = now - self.startup_mark
+        self.startup_mark = now
 
     def get_system_timezone(self):
-        try:
-            return str(pytz.timezone(datetime.now().astimezone().tzinfo.name))
-        except:
-            return 'Asia/Tehran'
+        from time_service import system_timezone
+        return system_timezone()
 
-    def load_holidays(self):
-        return {
-            'gregorian': {
-                (1, 1): 'New Year',
-                (12, 25): 'Christmas'
-            },
-            'jalali': {
-                (1, 1): 'نوروز',
-                (1, 2): 'نوروز'
-            },
-            'hijri': {
-                (1, 10): 'عاشورا',
-                (12, 17): 'عید قربان'
-            }
-        }
+    def load_holidays(self, directory='calendar_clock_holidays'):
+        return load_holiday_index(directory, {'jalali': self.jalali_table, 'hijri': self.hijri_table})
 
     def gregorian_to_jalali(self, gy, gm, gd):
-        g_d_m = [0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334]
-        if gy > 1600:
-            jy = 979
-            gy -= 1600
-        else:
-            jy = 0
-            gy -= 621
-        if gm > 2:
-            gy2 = gy + 1
-        else:
-            gy2 = gy
-        days = (365 * gy) + (int((gy2 + 3) / 4)) - (int((gy2 + 99) / 100)) + (int((gy2 + 399) / 400)) - 80 + gd + g_d_m[gm - 1]
-        jy += 33 * (int(days / 12053))
-        days %= 12053
-        jy += 4 * (int(days / 1461))
-        days %= 1461
-        if days > 365:
-            jy += int((days - 1) / 365)
-            days = (days - 1) % 365
-        if days < 186:
-            jm = 1 + int(days / 31)
-            jd = 1 + (days % 31)
-        else:
-            jm = 7 + int((days - 186) / 30)
-            jd = 1 + ((days - 186) % 30)
-        return [jy, jm, jd]
+        return calendar_engine.gregorian_to_jalali(gy, gm, gd)
 
     def gregorian_to_hijri(self, gy, gm, gd):
-        d = date(gy, gm, gd)
-        jd = int((d - date(1, 1, 1)).days + 2)
-        z = jd + 1721424
-        l = z - 1948440
-        n = int((l - 1) / 10631)
-        l = l - 10631 * n + 354
-        j = (int((10985 - l) / 5316)) * (int((50 * l) / 17719)) + (int(l / 5670)) * (int((43 * l) / 15238))
-        l = l - (int((30 - j) / 15)) * (int((17719 * j) / 50)) - (int(j / 16)) * (int((15238 * j) / 43)) + 29
-        hy = 30 * n + j - 30
-        hm = l
-        hd = z - (355 * n + 355 * j + (int((l + 1) / 30)) * 30 + l) + 1948440 - 1
-        return [hy, hm, hd]
+        return calendar_engine.gregorian_to_hijri(gy, gm, gd)
 
     def days_in_jalali_month(self, jy, jm):
-        if jm <= 6:
-            return 31
-        elif jm <= 11:
-            return 30
-        else:
-            return 29 if (jy % 33) % 4 == 1 else 30
+        return calendar_engine.days_in_jalali_month(jy, jm)
 
     def days_in_hijri_month(self, hy, hm):
-        if hm in [1, 3, 5, 7, 8, 10, 12]:
-            return 30
-        elif hm == 2:
-            return 29 if (hy % 30) % 2 == 1 else 28
-        else:
-            return 29
+        return calendar_engine.days_in_hijri_month(hy, hm)
 
     def jalali_weekday(self, jy, jm, jd):
-        g_date = self.jalali_to_gregorian(jy, jm, jd)
-        return date(g_date[0], g_date[1], g_date[2]).weekday()
+        return calendar_engine.jalali_weekday(jy, jm, jd)
 
     def hijri_weekday(self, hy, hm, hd):
-        g_date = self.hijri_to_gregorian(hy, hm, hd)
-        return date(g_date[0], g_date[1], g_date[2]).weekday()
+        return calendar_engine.hijri_weekday(hy, hm, hd)
 
     def jalali_to_gregorian(self, jy, jm, jd):
-        if jy > 979:
-            gy = 1600
-            jy -= 979
-        else:
-            gy = 621
-        if jm < 7:
-            days = (jm - 1) * 31
-        else:
-            days = ((jm - 7) * 30) + 186
-        days += 365 * jy + (int(jy / 33)) * 8 + (int(((jy % 33) + 3) / 4)) + 78 + jd
-        gy += 400 * (int(days / 146097))
-        days %= 146097
-        if days > 36524:
-            gy += 100 * (int(days / 36524))
-            days %= 36524
-            if days >= 365:
-                days += 1
-        gy += 4 * (int(days / 1461))
-        days %= 1461
-        if days > 365:
-            gy += int((days - 1) / 365)
-            days = (days - 1) % 365
-        gd = days + 1
-        if (gy % 4 == 0 and gy % 100 != 0) or (gy % 400 == 0):
-            g_d_m = [0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-        else:
-            g_d_m = [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-        gm = 0
-        while gm < 13 and gd > g_d_m[gm]:
-            gd -= g_d_m[gm]
-            gm += 1
-        return [gy, gm, gd]
+        return calendar_engine.jalali_to_gregorian(jy, jm, jd)
 
     def hijri_to_gregorian(self, hy, hm, hd):
-        jd = hd + (int((29 * (hm - 1) + 13) / 30)) + 355 * (hy % 30) + 10631 * (int(hy / 30)) + 1948439
-        z = jd - 1721424
-        w = int((z - 0.5) / 146097)
-        z = z - w * 146097
-        x = int((z - 0.5) / 36524)
-        if x == 4:
-            x = 3
-        z = z - x * 36524
-        y = int((z - 0.5) / 1461)
-        z = z - y * 1461
-        n = int((z - 0.5) / 365)
-        z = z - n * 365
-        gy = 400 * w + 100 * x + 4 * y + n
-        gd = z
-        if (gy % 4 == 0 and gy % 100 != 0) or (gy % 400 == 0):
-            g_d_m = [0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-        else:
-            g_d_m = [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-        gm = 0
-        while gm < 13 and gd > g_d_m[gm]:
-            gd -= g_d_m[gm]
-            gm += 1
-        return [gy, gm, gd]
+        return calendar_engine.hijri_to_gregorian(hy, hm, hd)
 
     def init_ui(self):
         self.central_widget = QWidget()
+        self.central_widget.setObjectName('central')
         self.setCentralWidget(self.central_widget)
         self.main_layout = QVBoxLayout(self.central_widget)
         self.main_layout.setContentsMargins(20, 20, 20, 20)
         self.main_layout.setSpacing(15)
 
         self.menu_bar = QMenuBar()
-        self.file_menu = QMenu(self.texts['en']['file_menu'])
-        self.exit_action = self.file_menu.addAction(self.texts['en']['exit_action'])
+        self.file_menu = QMenu(self.catalog['file_menu'])
+        self.exit_action = self.file_menu.addAction(self.catalog['exit_action'])
         self.exit_action.triggered.connect(self.close)
-        self.about_action = self.file_menu.addAction(self.texts['en']['about'])
+        self.about_action = self.file_menu.addAction(self.catalog['about'])
         self.about_action.triggered.connect(self.show_about)
         self.menu_bar.addMenu(self.file_menu)
         self.main_layout.addWidget(self.menu_bar)
 
         self.tabs = QTabWidget()
-        self.tabs.setStyleSheet("""
-            QTabWidget::pane {
-                border: 1px solid rgba(0, 0, 0, 0.1);
-                border-radius: 8px;
-                background: rgba(255, 255, 255, 0.95);
-            }
-            QTabBar::tab {
-                padding: 10px 20px;
-                margin-right: 5px;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-                background: rgba(0, 0, 0, 0.05);
-                color: black;
-            }
-            QTabBar::tab:selected {
-                background: rgba(0, 90, 158, 0.3);
-                font-weight: bold;
-                color: black;
-            }
-        """)
         self.main_layout.addWidget(self.tabs)
 
         self.calendar_tab = QWidget()
@@ -517,42 +450,18 @@ class CalendarClockApp(QMainWindow):
         self.month_label = QLabel()
         self.month_label.setFont(QFont("Segoe UI", 12))
         self.month_combo = QComboBox()
-        self.month_combo.addItems([
-            'January', 'February', 'March', 'April', 'May', 'June',
-            'July', 'August', 'September', 'October', 'November', 'December'
-        ])
+        self.month_combo.addItems(self.catalog.list('months'))
         self.month_combo.setCurrentIndex(self.current_month - 1)
         self.month_combo.setFixedHeight(40)
-        self.month_combo.setStyleSheet("""
-            QComboBox {
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.2);
-                background: rgba(255, 255, 255, 0.95);
-                color: black;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-        """)
-        self.month_combo.currentIndexChanged.connect(self.update_calendar)
+        self.month_combo.currentIndexChanged.connect(self.on_month_changed)
 
         self.year_label = QLabel()
         self.year_label.setFont(QFont("Segoe UI", 12))
         self.year_input = QLineEdit(str(self.current_year))
         self.year_input.setFixedHeight(40)
-        self.year_input.setStyleSheet("""
-            QLineEdit {
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.2);
-                background: rgba(255, 255, 255, 0.95);
-                color: black;
-            }
-        """)
-        self.year_input.textChanged.connect(self.update_calendar)
+        self.year_input.setValidator(QIntValidator(FIRST_YEAR, MAXYEAR, self.year_input))
+        self.year_input.textEdited.connect(self.on_year_edited)
+        self.year_input.returnPressed.connect(self.flush_refreshes)
 
         self.calendar_label = QLabel()
         self.calendar_label.setFont(QFont("Segoe UI", 12))
@@ -574,8 +483,50 @@ class CalendarClockApp(QMainWindow):
         self.calendar_layout_inner.addWidget(self.gregorian_container)
         self.calendar_layout_inner.addWidget(self.jalali_container)
         self.calendar_layout_inner.addWidget(self.hijri_container)
+        self.init_calendar_cells()
+
+        calendar_selection_layout = QHBoxLayout()
+        calendar_selection_layout.addWidget(self.month_label)
+        calendar_selection_layout.addWidget(self.month_combo)
+        calendar_selection_layout.addWidget(self.year_label)
+        calendar_selection_layout.addWidget(self.year_input)
+
+        self.calendar_layout.addWidget(self.calendar_label)
+        self.calendar_layout.addLayout(calendar_selection_layout)
+        self.calendar_layout.addWidget(self.calendar_container)
 
         self.clock_tab = QWidget()
+        self.history_tab = QWidget()
+        self.settings_tab = QWidget()
+
+        self.tabs.addTab(self.calendar_tab, self.catalog['calendar_tab'])
+        self.tabs.addTab(self.clock_tab, self.catalog['history_tab'])
+        self.tabs.addTab(self.history_tab, self.catalog['history_tab'])
+        self.tabs.addTab(self.settings_tab, self.catalog['settings_tab'])
+        self.tab_names = ['calendar', 'clock', 'history', 'settings']
+        self.tab_builders = {
+            'clock': self.build_clock_tab,
+            'history': self.build_history_tab,
+            'settings': self.build_settings_tab
+        }
+        self.built_tabs = {'calendar'}
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+
+        self.update_calendar()
+
+    def ensure_tab_built(self, name):
+        if name in self.built_tabs:
+            return
+        started = time.perf_counter()
+        self.built_tabs.add(name)
+        self.tab_builders[name]()
+        self.startup_timings[f'tab_{name}'] = time.perf_counter() - started
+
+    def build_clock_tab(self):
+        import pytz
+        from time_service import ClockBoard
+        self.clock_board = ClockBoard([self.get_system_timezone()], self.time_format,
+                                      precision=self.display_precision)
         self.clock_layout = QVBoxLayout(self.clock_tab)
         self.clock_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         self.clock_layout.setSpacing(10)
@@ -595,107 +546,48 @@ class CalendarClockApp(QMainWindow):
         self.country_combo.addItems(self.countries.keys())
         self.country_combo.setCurrentText('Iran')
         self.country_combo.setFixedHeight(40)
-        self.country_combo.setStyleSheet("""
-            QComboBox {
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.2);
-                background: rgba(255, 255, 255, 0.95);
-                color: black;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-        """)
         self.country_combo.currentTextChanged.connect(self.update_timezone_combo)
 
         self.timezone_label = QLabel()
         self.timezone_label.setFont(QFont("Segoe UI", 12))
         self.timezone_combo = QComboBox()
         self.timezone_combo.addItems(pytz.common_timezones)
-        self.timezone_combo.setCurrentText(self.timezones[0])
+        self.timezone_combo.setEditable(True)
+        self.timezone_combo.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        self.timezone_combo.setCurrentText(self.clock_board.zones[0])
+        self.timezone_index = None
+        self.timezone_search_model = TimezoneSearchModel(self)
+        self.timezone_completer = QCompleter(self.timezone_search_model, self)
+        self.timezone_completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.timezone_combo.setCompleter(self.timezone_completer)
+        self.timezone_combo.lineEdit().textEdited.connect(self.on_timezone_search)
         self.timezone_combo.setFixedHeight(40)
-        self.timezone_combo.setStyleSheet("""
-            QComboBox {
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.2);
-                background: rgba(255, 255, 255, 0.95);
-                color: black;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-        """)
 
         self.add_timezone_btn = QPushButton()
         self.add_timezone_btn.setFixedHeight(40)
         self.add_timezone_btn.setFont(QFont("Segoe UI", 12))
-        self.add_timezone_btn.setStyleSheet("""
-            QPushButton {
-                border-radius: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.1);
-                background: rgba(0, 90, 158, 0.8);
-                color: white;
-            }
-            QPushButton:hover {
-                background: rgba(0, 90, 158, 1.0);
-            }
-        """)
         self.add_timezone_btn.clicked.connect(self.add_timezone)
 
         self.remove_timezone_btn = QPushButton()
         self.remove_timezone_btn.setFixedHeight(40)
         self.remove_timezone_btn.setFont(QFont("Segoe UI", 12))
-        self.remove_timezone_btn.setStyleSheet("""
-            QPushButton {
-                border-radius: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.1);
-                background: rgba(200, 0, 0, 0.8);
-                color: white;
-            }
-            QPushButton:hover {
-                background: rgba(200, 0, 0, 1.0);
-            }
-        """)
+        self.remove_timezone_btn.setProperty('buttonRole', 'danger')
         self.remove_timezone_btn.clicked.connect(self.remove_timezone)
 
         self.format_label = QLabel()
         self.format_label.setFont(QFont("Segoe UI", 12))
         self.format_combo = QComboBox()
-        self.format_combo.addItems([self.texts['en']['format_12'], self.texts['en']['format_24']])
+        self.format_combo.addItems([self.catalog['format_12'], self.catalog['format_24']])
         self.format_combo.setFixedHeight(40)
-        self.format_combo.setStyleSheet("""
-            QComboBox {
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.2);
-                background: rgba(255, 255, 255, 0.95);
-                color: black;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-        """)
         self.format_combo.currentIndexChanged.connect(self.change_format)
+        self.precision_combo = QComboBox()
+        self.precision_combo.addItems([self.catalog['precision_seconds'], self.catalog['precision_minutes']])
+        self.precision_combo.setFixedHeight(40)
+        self.precision_combo.currentIndexChanged.connect(self.change_precision)
 
         self.timezone_list = QListWidget()
         self.timezone_list.setFixedHeight(100)
-        self.timezone_list.setStyleSheet("""
-            QListWidget {
-                border-radius: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.2);
-                background: rgba(255, 255, 255, 0.95);
-                color: black;
-            }
-        """)
-        for tz in self.timezones:
+        for tz in self.clock_board.zones:
             self.timezone_list.addItem(tz)
 
         self.digital_label = QLabel()
@@ -713,42 +605,11 @@ class CalendarClockApp(QMainWindow):
         self.copy_btn = QPushButton()
         self.copy_btn.setFixedHeight(40)
         self.copy_btn.setFont(QFont("Segoe UI", 12))
-        self.copy_btn.setStyleSheet("""
-            QPushButton {
-                border-radius: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.1);
-                background: rgba(0, 90, 158, 0.8);
-                color: white;
-            }
-            QPushButton:hover {
-                background: rgba(0, 90, 158, 1.0);
-            }
-        """)
         self.copy_btn.clicked.connect(self.copy_to_clipboard)
 
         self.status_text = QTextEdit()
         self.status_text.setReadOnly(True)
         self.status_text.setFixedHeight(100)
-        self.status_text.setStyleSheet("""
-            QTextEdit {
-                border-radius: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.2);
-                background: rgba(255, 255, 255, 0.95);
-                color: black;
-            }
-        """)
-
-        calendar_selection_layout = QHBoxLayout()
-        calendar_selection_layout.addWidget(self.month_label)
-        calendar_selection_layout.addWidget(self.month_combo)
-        calendar_selection_layout.addWidget(self.year_label)
-        calendar_selection_layout.addWidget(self.year_input)
-
-        self.calendar_layout.addWidget(self.calendar_label)
-        self.calendar_layout.addLayout(calendar_selection_layout)
-        self.calendar_layout.addWidget(self.calendar_container)
 
         timezone_layout = QHBoxLayout()
         timezone_layout.addWidget(self.country_label)
@@ -761,7 +622,10 @@ class CalendarClockApp(QMainWindow):
         self.clock_layout.addLayout(timezone_layout)
         self.clock_layout.addWidget(self.timezone_list)
         self.clock_layout.addWidget(self.format_label)
-        self.clock_layout.addWidget(self.format_combo)
+        format_layout = QHBoxLayout()
+        format_layout.addWidget(self.format_combo)
+        format_layout.addWidget(self.precision_combo)
+        self.clock_layout.addLayout(format_layout)
         self.clock_layout.addWidget(self.digital_label)
         self.clock_layout.addWidget(self.digital_container)
         self.clock_layout.addWidget(self.analog_label)
@@ -769,58 +633,44 @@ class CalendarClockApp(QMainWindow):
         self.clock_layout.addWidget(self.copy_btn)
         self.clock_layout.addWidget(self.status_text)
 
-        self.history_tab = QWidget()
+        self.update_clock_texts()
+        self.update_clocks_ui()
+        for _, analog_clock in self.clocks:
+            analog_clock.set_theme(self.current_theme)
+
+    def build_history_tab(self):
+        self.load_history()
         self.history_layout = QVBoxLayout(self.history_tab)
-        self.history_scroll = QScrollArea()
-        self.history_scroll.setWidgetResizable(True)
-        self.history_content = QWidget()
-        self.history_grid = QGridLayout(self.history_content)
-        self.history_grid.setSpacing(10)
-        self.history_scroll.setWidget(self.history_content)
-        self.history_scroll.setStyleSheet("""
-            QScrollArea {
-                border: 1px solid rgba(0, 0, 0, 0.1);
-                border-radius: 8px;
-                background: rgba(255, 255, 255, 0.95);
-            }
-        """)
+        self.history_model = HistoryTableModel(self.history, self)
+        self.history_view = QTableView()
+        self.history_view.setModel(self.history_model)
+        self.history_view.setWordWrap(False)
+        self.history_view.setShowGrid(False)
+        self.history_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.history_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.history_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerItem)
+        self.history_view.verticalScrollBar().valueChanged.connect(self.on_history_scrolled)
+        self.history_view.verticalHeader().setVisible(False)
+        self.history_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.history_view.verticalHeader().setDefaultSectionSize(30)
+        self.history_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.clear_history_btn = QPushButton()
         self.clear_history_btn.setFixedHeight(40)
         self.clear_history_btn.setFont(QFont("Segoe UI", 12))
-        self.clear_history_btn.setStyleSheet("""
-            QPushButton {
-                border-radius: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.1);
-                background: rgba(200, 0, 0, 0.8);
-                color: white;
-            }
-            QPushButton:hover {
-                background: rgba(200, 0, 0, 1.0);
-            }
-        """)
+        self.clear_history_btn.setProperty('buttonRole', 'danger')
         self.clear_history_btn.clicked.connect(self.clear_history)
         self.save_history_btn = QPushButton()
         self.save_history_btn.setFixedHeight(40)
         self.save_history_btn.setFont(QFont("Segoe UI", 12))
-        self.save_history_btn.setStyleSheet("""
-            QPushButton {
-                border-radius: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.1);
-                background: rgba(0, 90, 158, 0.8);
-                color: white;
-            }
-            QPushButton:hover {
-                background: rgba(0, 90, 158, 1.0);
-            }
-        """)
         self.save_history_btn.clicked.connect(self.save_history_to_file)
-        self.history_layout.addWidget(self.history_scroll)
+        self.history_layout.addWidget(self.history_view)
         self.history_layout.addWidget(self.clear_history_btn)
         self.history_layout.addWidget(self.save_history_btn)
 
-        self.settings_tab = QWidget()
+        self.update_history_texts()
+        self.update_history_ui()
+
+    def build_settings_tab(self):
         self.settings_layout = QVBoxLayout(self.settings_tab)
         self.settings_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         self.settings_layout.setSpacing(10)
@@ -830,19 +680,6 @@ class CalendarClockApp(QMainWindow):
         self.language_combo = QComboBox()
         self.language_combo.addItems(['English', 'فارسی', '中文', 'Русский'])
         self.language_combo.setFixedHeight(40)
-        self.language_combo.setStyleSheet("""
-            QComboBox {
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.2);
-                background: rgba(255, 255, 255, 0.95);
-                color: black;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-        """)
         self.language_combo.currentIndexChanged.connect(self.change_language)
 
         self.theme_label = QLabel()
@@ -850,57 +687,59 @@ class CalendarClockApp(QMainWindow):
         self.theme_combo = QComboBox()
         self.theme_combo.addItems(['Windows11', 'Dark', 'Light', 'Red', 'Blue'])
         self.theme_combo.setFixedHeight(40)
-        self.theme_combo.setStyleSheet("""
-            QComboBox {
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.2);
-                background: rgba(255, 255, 255, 0.95);
-                color: black;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-        """)
         self.theme_combo.currentIndexChanged.connect(self.change_theme)
 
         self.apply_btn = QPushButton()
         self.apply_btn.setFixedHeight(40)
         self.apply_btn.setFont(QFont("Segoe UI", 12))
-        self.apply_btn.setStyleSheet("""
-            QPushButton {
-                border-radius: 8px;
-                font-size: 14px;
-                border: 1px solid rgba(0, 0, 0, 0.1);
-                background: rgba(0, 90, 158, 0.8);
-                color: white;
-            }
-            QPushButton:hover {
-                background: rgba(0, 90, 158, 1.0);
-            }
-        """)
         self.apply_btn.clicked.connect(self.apply_settings)
 
+        self.profiler_label = QLabel()
+        self.profiler_label.setFont(QFont("Segoe UI", 12))
+        self.profiler_check = QCheckBox()
+        self.profiler_check.setChecked(profiler.enabled)
+        self.profiler_check.toggled.connect(self.toggle_profiler)
+        self.profiler_export_btn = QPushButton()
+        self.profiler_export_btn.setFixedHeight(40)
+        self.profiler_export_btn.setFont(QFont("Segoe UI", 12))
+        self.profiler_export_btn.clicked.connect(self.export_profile)
+        self.profiler_view = QPlainTextEdit()
+        self.profiler_view.setReadOnly(True)
+        self.profiler_view.setFont(QFont("Consolas", 10))
+        self.profiler_view.setFixedHeight(200)
+        self.profiler_view.setVisible(profiler.enabled)
+        self.profiler_timer = QTimer(self)
+        self.profiler_timer.timeout.connect(self.update_profiler_view)
+
+        profiler_layout = QHBoxLayout()
+        profiler_layout.addWidget(self.profiler_check)
+        profiler_layout.addWidget(self.profiler_export_btn)
+
         self.settings_layout.addWidget(self.language_label)
         self.settings_layout.addWidget(self.language_combo)
         self.settings_layout.addWidget(self.theme_label)
         self.settings_layout.addWidget(self.theme_combo)
         self.settings_layout.addWidget(self.apply_btn)
+        self.settings_layout.addWidget(self.profiler_label)
+        self.settings_layout.addLayout(profiler_layout)
+        self.settings_layout.addWidget(self.profiler_view)
         self.settings_layout.addStretch()
 
-        self.tabs.addTab(self.calendar_tab, self.texts['en']['calendar_tab'])
-        self.tabs.addTab(self.clock_tab, self.texts['en']['history_tab'])
-        self.tabs.addTab(self.history_tab, self.texts['en']['history_tab'])
-        self.tabs.addTab(self.settings_tab, self.texts['en']['settings_tab'])
-
-        self.update_clocks_ui()
-        self.update_clocks()
-        self.update_calendar()
+        langs = ['en', 'fa', 'zh', 'ru']
+        themes = ['Windows11', 'Dark', 'Light', 'Red', 'Blue']
+        self.language_combo.blockSignals(True)
+        self.language_combo.setCurrentIndex(langs.index(self.current_lang))
+        self.language_combo.blockSignals(False)
+        self.theme_combo.blockSignals(True)
+        self.theme_combo.setCurrentIndex(themes.index(self.current_theme))
+        self.theme_combo.blockSignals(False)
+        self.update_settings_texts()
 
     def apply_theme(self, theme_name):
+        if theme_name not in self.themes:
+            theme_name = 'Windows11'
         palette = QPalette()
-        theme = self.themes.get(theme_name, self.themes['Windows11'])
+        theme = self.themes[theme_name]
         palette.setColor(QPalette.ColorRole.Window, theme['background'])
         palette.setColor(QPalette.ColorRole.WindowText, theme['text'])
         palette.setColor(QPalette.ColorRole.Button, theme['button'])
@@ -910,88 +749,215 @@ class CalendarClockApp(QMainWindow):
         palette.setColor(QPalette.ColorRole.AlternateBase, theme['header'])
         palette.setColor(QPalette.ColorRole.Text, theme['text'])
         self.setPalette(palette)
-        self.setStyle(QStyleFactory.create('WindowsVista' if theme_name == 'Windows11' else 'Fusion'))
-        self.update_calendar()
+        style_name = 'WindowsVista' if theme_name == 'Windows11' else 'Fusion'
+        if style_name != self.style_name:
+            self.style_name = style_name
+            self.setStyle(QStyleFactory.create(style_name))
+        self.setStyleSheet(self.theme_compiler.stylesheet(theme_name))
+        for _, analog_clock in self.clocks:
+            analog_clock.set_theme(theme_name)
 
     def update_texts(self):
-        lang = self.current_lang
-        self.setWindowTitle(self.texts[lang]['title'])
-        self.country_label.setText(self.texts[lang]['country_label'])
-        self.timezone_label.setText(self.texts[lang]['timezone_label'])
-        self.add_timezone_btn.setText(self.texts[lang]['add_timezone_btn'])
-        self.remove_timezone_btn.setText(self.texts[lang]['remove_timezone_btn'])
-        self.format_label.setText(self.texts[lang]['format_label'])
-        self.digital_label.setText(self.texts[lang]['digital_label'])
-        self.analog_label.setText(self.texts[lang]['analog_label'])
-        self.calendar_label.setText(self.texts[lang]['calendar_label'])
-        self.month_label.setText(self.texts[lang]['month_label'])
-        self.year_label.setText(self.texts[lang]['year_label'])
-        self.copy_btn.setText(self.texts[lang]['copy_btn'])
-        self.status_text.setText(self.texts[lang]['status_idle'])
-        self.clear_history_btn.setText(self.texts[lang]['clear_history'])
-        self.save_history_btn.setText(self.texts[lang]['save_history'])
-        self.language_label.setText(self.texts[lang]['language_label'])
-        self.theme_label.setText(self.texts[lang]['theme_label'])
-        self.apply_btn.setText(self.texts[lang]['apply'])
-        self.file_menu.setTitle(self.texts[lang]['file_menu'])
-        self.exit_action.setText(self.texts[lang]['exit_action'])
-        self.about_action.setText(self.texts[lang]['about'])
-
-        self.tabs.setTabText(0, self.texts[lang]['calendar_tab'])
-        self.tabs.setTabText(1, self.texts[lang]['history_tab'])
-        self.tabs.setTabText(2, self.texts[lang]['history_tab'])
-        self.tabs.setTabText(3, self.texts[lang]['settings_tab'])
-
-        current_format = self.format_combo.currentText()
-        self.format_combo.clear()
-        self.format_combo.addItems([self.texts[lang]['format_12'], self.texts[lang]['format_24']])
-        if current_format:
-            index = 0 if current_format == self.texts['en']['format_12'] else 1
-            self.format_combo.setCurrentIndex(index)
-
-        if lang == 'fa':
-            self.month_combo.clear()
-            self.month_combo.addItems([
-                'فروردین', 'اردیبهشت', 'خرداد', 'تیر', 'مرداد', 'شهریور',
-                'مهر', 'آبان', 'آذر', 'دی', 'بهمن', 'اسفند'
-            ])
-            self.month_combo.setCurrentIndex(self.current_month - 1)
-        else:
-            self.month_combo.clear()
-            self.month_combo.addItems([
-                'January', 'February', 'March', 'April', 'May', 'June',
-                'July', 'August', 'September', 'October', 'November', 'December'
-            ])
-            self.month_combo.setCurrentIndex(self.current_month - 1)
-
-        alignment = Qt.AlignmentFlag.AlignRight if lang == 'fa' else Qt.AlignmentFlag.AlignLeft
+        self.setWindowTitle(self.catalog['title'])
+        self.file_menu.setTitle(self.catalog['file_menu'])
+        self.exit_action.setText(self.catalog['exit_action'])
+        self.about_action.setText(self.catalog['about'])
+
+        self.tabs.setTabText(0, self.catalog['calendar_tab'])
+        self.tabs.setTabText(1, self.catalog['history_tab'])
+        self.tabs.setTabText(2, self.catalog['history_tab'])
+        self.tabs.setTabText(3, self.catalog['settings_tab'])
+
+        self.update_calendar_texts()
+        if 'clock' in self.built_tabs:
+            self.update_clock_texts()
+        if 'history' in self.built_tabs:
+            self.update_history_texts()
+        if 'settings' in self.built_tabs:
+            self.update_settings_texts()
+
+    def text_alignment(self):
+        return Qt.AlignmentFlag.AlignRight if self.current_lang == 'fa' else Qt.AlignmentFlag.AlignLeft
+
+    def update_calendar_texts(self):
+        self.calendar_label.setText(self.catalog['calendar_label'])
+        self.month_label.setText(self.catalog['month_label'])
+        self.year_label.setText(self.catalog['year_label'])
+
+        for index, month in enumerate(self.catalog.list('months')):
+            self.month_combo.setItemText(index, month)
+
+        weekdays = self.catalog.list('weekdays')
+        for system in ['gregorian', 'jalali', 'hijri']:
+            cells = self.calendar_cells[system]
+            cells['title'].setText(self.catalog[system])
+            for label, header in zip(cells['headers'], weekdays):
+                label.setText(header)
+
+        alignment = self.text_alignment()
+        self.calendar_label.setAlignment(alignment)
+        self.month_label.setAlignment(alignment)
+        self.year_label.setAlignment(alignment)
+
+    def update_clock_texts(self):
+        self.country_label.setText(self.catalog['country_label'])
+        self.timezone_label.setText(self.catalog['timezone_label'])
+        self.add_timezone_btn.setText(self.catalog['add_timezone_btn'])
+        self.remove_timezone_btn.setText(self.catalog['remove_timezone_btn'])
+        self.format_label.setText(self.catalog['format_label'])
+        self.digital_label.setText(self.catalog['digital_label'])
+        self.analog_label.setText(self.catalog['analog_label'])
+        self.copy_btn.setText(self.catalog['copy_btn'])
+        self.status_text.setText(self.catalog['status_idle'])
+
+        self.format_combo.setItemText(0, self.catalog['format_12'])
+        self.format_combo.setItemText(1, self.catalog['format_24'])
+        self.precision_combo.setItemText(0, self.catalog['precision_seconds'])
+        self.precision_combo.setItemText(1, self.catalog['precision_minutes'])
+
+        alignment = self.text_alignment()
         self.country_label.setAlignment(alignment)
         self.timezone_label.setAlignment(alignment)
         self.format_label.setAlignment(alignment)
         self.digital_label.setAlignment(alignment)
         self.analog_label.setAlignment(alignment)
-        self.calendar_label.setAlignment(alignment)
-        self.month_label.setAlignment(alignment)
-        self.year_label.setAlignment(alignment)
+
+    def update_history_texts(self):
+        self.clear_history_btn.setText(self.catalog['clear_history'])
+        self.save_history_btn.setText(self.catalog['save_history'])
+
+    def update_settings_texts(self):
+        self.language_label.setText(self.catalog['language_label'])
+        self.theme_label.setText(self.catalog['theme_label'])
+        self.apply_btn.setText(self.catalog['apply'])
+        self.profiler_label.setText(self.catalog['profiler_label'])
+        self.profiler_check.setText(self.catalog['profiler_enable'])
+        self.profiler_export_btn.setText(self.catalog['profiler_export'])
+
+        alignment = self.text_alignment()
         self.language_label.setAlignment(alignment)
         self.theme_label.setAlignment(alignment)
+        self.profiler_label.setAlignment(alignment)
+
+    def init_refresh_scheduler(self):
+        self.pending_refreshes = {}
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.timeout.connect(self.flush_refreshes)
+
+    def init_tick_scheduler(self):
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.on_tick)
+
+    def init_midnight_timer(self):
+        # Redraws the calendar views when the date changes, so the today
+        # marker moves without the user navigating.
+        self.midnight_timer = QTimer(self)
+        self.midnight_timer.setSingleShot(True)
+        self.midnight_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.midnight_timer.timeout.connect(self.on_midnight)
+        self.schedule_midnight()
+
+    def schedule_midnight(self):
+        now = datetime.now().astimezone()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time()).astimezone()
+        self.midnight_timer.start(max(1, math.ceil((midnight - now).total_seconds() * 1000)))
+
+    def on_midnight(self):
+        if 'calendar' in self.built_tabs:
+            self.update_calendar()
+        self.schedule_midnight()
+
+    def tick_interval(self):
+        # Seconds between clock ticks, or None while nothing that shows the
+        # time is on screen.
+        if not self.isVisible() or self.isMinimized():
+            return None
+        if 'clock' not in self.built_tabs or self.tabs.currentWidget() is not self.clock_tab:
+            return None
+        return self.clock_board.tick_interval
+
+    def schedule_tick(self):
+        from time_service import next_tick_delay
+        interval = self.tick_interval()
+        if interval is None:
+            self.timer.stop()
+            return
+        self.timer.start(max(1, round(next_tick_delay(interval) * 1000)))
+
+    def on_tick(self):
+        self.update_clocks()
+        self.schedule_tick()
+
+    def update_tick_schedule(self):
+        # Called when visibility or the current tab changes: catch the clocks
+        # up straight away when they come back into view.
+        was_active = self.timer.isActive()
+        self.schedule_tick()
+        if self.timer.isActive() and not was_active:
+            self.update_clocks()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_tick_schedule()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_tick_schedule()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.update_tick_schedule()
+
+    def schedule_refresh(self, name, callback, delay=250):
+        # Requests with the same name collapse into one call that runs once
+        # the input has been quiet for `delay` milliseconds.
+        self.pending_refreshes[name] = callback
+        self.refresh_timer.start(delay)
+
+    def flush_refreshes(self):
+        self.refresh_timer.stop()
+        pending, self.pending_refreshes = self.pending_refreshes, {}
+        for callback in pending.values():
+            callback()
+
+    def on_year_edited(self, text):
+        if self.year_input.hasAcceptableInput():
+            self.schedule_refresh('calendar', self.update_calendar)
+
+    def on_month_changed(self, index):
+        self.schedule_refresh('calendar', self.update_calendar, delay=0)
+
+    def refresh_language(self):
+        self.catalog = load_catalog(self.current_lang)
+        self.update_texts()
+        self.update_history_ui()
 
     def change_language(self, index):
         langs = ['en', 'fa', 'zh', 'ru']
         self.current_lang = langs[index]
-        self.update_texts()
-        self.update_history_ui()
-        self.update_clocks()
-        self.update_calendar()
+        self.schedule_refresh('language', self.refresh_language)
 
     def change_theme(self, index):
         themes = ['Windows11', 'Dark', 'Light', 'Red', 'Blue']
         self.current_theme = themes[index]
-        self.apply_theme(self.current_theme)
+        self.schedule_refresh('theme', lambda: self.apply_theme(self.current_theme))
 
     def change_format(self, index):
         self.time_format = '12' if index == 0 else '24'
+        self.clock_board.set_format(self.time_format)
+        self.update_clocks()
+
+    def change_precision(self, index):
+        self.display_precision = 'seconds' if index == 0 else 'minutes'
+        self.clock_board.set_precision(self.display_precision)
+        for widgets in self.clock_widgets.values():
+            widgets['analog'].set_show_seconds(self.display_precision == 'seconds')
         self.update_clocks()
+        self.schedule_tick()
 
     def apply_settings(self):
         self.update_texts()
@@ -999,322 +965,339 @@ class CalendarClockApp(QMainWindow):
         self.update_clocks()
         self.update_calendar()
 
+    def toggle_profiler(self, enabled):
+        if enabled:
+            profiler.enable()
+        else:
+            profiler.disable()
+        self.profiler_view.setVisible(enabled)
+        self.update_profiler_view()
+
+    def update_profiler_view(self):
+        # Refreshed once a second while the Settings tab shows the panel.
+        if not profiler.enabled or self.tabs.currentWidget() is not self.settings_tab:
+            self.profiler_timer.stop()
+            return
+        widgets = len(QApplication.allWidgets())
+        rss = rss_bytes()
+        profiler.sample(widgets=widgets, rss_mb=round(rss / 1048576, 1) if rss else 0)
+        lines = [f"{'':36s}{'calls':>7s}{'mean':>9s}{'p50':>9s}{'p95':>9s}{'max':>9s}  ms"]
+        for label, stats in profiler.summary().items():
+            lines.append(f"{label:36s}{stats['count']:7d}" + ''.join(
+                f"{stats[key] * 1000:9.2f}" for key in ('mean', 'p50', 'p95', 'max')))
+        lines.append('')
+        lines.append(f"widgets: {widgets}    RSS: {rss / 1048576:.1f} MB" if rss else f"widgets: {widgets}")
+        self.profiler_view.setPlainText('\n'.join(lines))
+        if not self.profiler_timer.isActive():
+            self.profiler_timer.start(1000)
+
+    def export_profile(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, self.catalog['profiler_export'], "", "JSON Files (*.json)")
+        if file_path:
+            self.dump_profile(file_path)
+
+    def dump_profile(self, path):
+        profiler.dump(path, widgets=len(QApplication.allWidgets()), rss_bytes=rss_bytes(),
+                      startup=self.startup_timings)
+
     def show_about(self):
-        QMessageBox.information(self, self.texts[self.current_lang]['about'], 
-                               self.texts[self.current_lang]['about_text'])
+        QMessageBox.information(self, self.catalog['about'], 
+                               self.catalog['about_text'])
 
     def update_timezone_combo(self, country):
         timezone = self.countries.get(country, 'Asia/Tehran')
         self.timezone_combo.setCurrentText(timezone)
 
+    def on_timezone_search(self, text):
+        if self.timezone_index is None:
+            from timezone_index import TimezoneIndex
+            self.timezone_index = TimezoneIndex()
+        self.timezone_search_model.set_results(self.timezone_index.search(text))
+        if self.timezone_search_model.results:
+            self.timezone_completer.complete()
+        else:
+            self.timezone_completer.popup().hide()
+
     def add_timezone(self):
-        timezone = self.timezone_combo.currentText()
-        if timezone not in self.timezones:
-            self.timezones.append(timezone)
+        import pytz
+        timezone = self.timezone_combo.currentText().strip()
+        if timezone not in pytz.all_timezones_set:
+            return
+        if self.clock_board.add_zone(timezone):
             self.timezone_list.addItem(timezone)
             self.update_clocks_ui()
-            self.status_text.setText(self.texts[self.current_lang]['status_added'].format(tz=timezone))
+            self.status_text.setText(self.catalog['status_added'].format(tz=timezone))
             self.add_to_history(timezone)
 
     def remove_timezone(self):
         selected = self.timezone_list.currentItem()
-        if selected and len(self.timezones) > 1:
+        if selected and len(self.clock_board.zones) > 1:
             timezone = selected.text()
-            self.timezones.remove(timezone)
+            self.clock_board.remove_zone(timezone)
             self.timezone_list.takeItem(self.timezone_list.row(selected))
             self.update_clocks_ui()
-            self.status_text.setText(self.texts[self.current_lang]['status_removed'].format(tz=timezone))
+            self.status_text.setText(self.catalog['status_removed'].format(tz=timezone))
             self.add_to_history(timezone, removed=True)
 
-    def update_clocks_ui(self):
-        for i in reversed(range(self.digital_layout.count())):
-            self.digital_layout.itemAt(i).widget().setParent(None)
-        for i in reversed(range(self.analog_layout.count())):
-            self.analog_layout.itemAt(i).widget().setParent(None)
-        self.clocks = []
+    def create_clock_widgets(self, tz):
+        digital_display = QLineEdit()
+        digital_display.setReadOnly(True)
+        digital_display.setFixedHeight(40)
+        digital_display.setProperty('clockRole', 'digital')
+        digital_label = QLabel(tz)
+        digital_label.setFont(QFont("Segoe UI", 10))
+        digital_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        analog_clock = ClockWidget()
+        analog_clock.set_theme(self.current_theme)
+        analog_clock.set_show_seconds(self.display_precision == 'seconds')
+        analog_label = QLabel(tz)
+        analog_label.setFont(QFont("Segoe UI", 10))
+        analog_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        for i, tz in enumerate(self.timezones):
-            digital_display = QLineEdit()
-            digital_display.setReadOnly(True)
-            digital_display.setFixedHeight(40)
-            digital_display.setStyleSheet("""
-                QLineEdit {
-                    border-radius: 8px;
-                    padding: 8px;
-                    font-size: 14px;
-                    font-weight: bold;
-                    border: 1px solid rgba(0, 0, 0, 0.2);
-                    background: rgba(255, 255, 255, 0.95);
-                    color: #0000FF;
-                }
-            """)
-            digital_label = QLabel(tz)
-            digital_label.setFont(QFont("Segoe UI", 10))
-            digital_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            digital_label.setStyleSheet("color: black;")
-            self.digital_layout.addWidget(digital_label, i * 2, 0)
-            self.digital_layout.addWidget(digital_display, i * 2 + 1, 0)
-
-            analog_clock = ClockWidget(tz)
-            self.analog_layout.addWidget(analog_clock, i // 2, i % 2)
-            analog_label = QLabel(tz)
-            analog_label.setFont(QFont("Segoe UI", 10))
-            analog_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            analog_label.setStyleSheet("color: black;")
-            self.analog_layout.addWidget(analog_label, (i // 2) + 1, i % 2)
-
-            self.clocks.append((digital_display, analog_clock))
+        return {
+            'digital_label': digital_label,
+            'digital': digital_display,
+            'analog': analog_clock,
+            'analog_label': analog_label,
+            'position': None,
+            'text': None
+        }
+
+    def place_clock_widgets(self, widgets, i):
+        if widgets['position'] == i:
+            return
+        if widgets['position'] is not None:
+            for name in ['digital_label', 'digital']:
+                self.digital_layout.removeWidget(widgets[name])
+            for name in ['analog', 'analog_label']:
+                self.analog_layout.removeWidget(widgets[name])
+        self.digital_layout.addWidget(widgets['digital_label'], i * 2, 0)
+        self.digital_layout.addWidget(widgets['digital'], i * 2 + 1, 0)
+        self.analog_layout.addWidget(widgets['analog'], (i // 2) * 2, i % 2)
+        self.analog_layout.addWidget(widgets['analog_label'], (i // 2) * 2 + 1, i % 2)
+        widgets['position'] = i
 
+    def update_clocks_ui(self):
+        zones = self.clock_board.zones
+        for tz in [tz for tz in self.clock_widgets if tz not in zones]:
+            widgets = self.clock_widgets.pop(tz)
+            for name in ['digital_label', 'digital']:
+                self.digital_layout.removeWidget(widgets[name])
+                widgets[name].setParent(None)
+            for name in ['analog', 'analog_label']:
+                self.analog_layout.removeWidget(widgets[name])
+                widgets[name].setParent(None)
+
+        for i, tz in enumerate(zones):
+            widgets = self.clock_widgets.get(tz)
+            if widgets is None:
+                widgets = self.clock_widgets[tz] = self.create_clock_widgets(tz)
+            self.place_clock_widgets(widgets, i)
+
+        self.clocks = [(self.clock_widgets[tz]['digital'], self.clock_widgets[tz]['analog']) for tz in zones]
         self.update_clocks()
 
     def update_clocks(self):
-        for i, (digital_display, analog_clock) in enumerate(self.clocks):
-            timezone = pytz.timezone(self.timezones[i])
-            current_time = datetime.now(timezone)
-            format_str = "%I:%M:%S %p" if self.time_format == '12' else "%H:%M:%S"
-            time_str = current_time.strftime(format_str)
-            digital_display.setText(time_str)
-            analog_clock.update_time()
-        self.status_text.setText(self.texts[self.current_lang]['status_updated'].format(time=datetime.now(pytz.timezone(self.timezones[0])).strftime(format_str)))
+        if 'clock' not in self.built_tabs:
+            return
+        snapshot = self.clock_snapshot = self.clock_board.snapshot()
+        clock_widgets = self.clock_widgets
+        for tz, current_time, text in zip(snapshot.zones, snapshot.local_times, snapshot.formatted):
+            widgets = clock_widgets[tz]
+            # Only touch widgets whose rendered output changed; in minutes
+            # mode that is one tick in sixty.
+            if widgets['text'] != text:
+                widgets['text'] = text
+                widgets['digital'].setText(text)
+            widgets['analog'].update_time(current_time)
+        status = self.catalog['status_updated'].format(time=snapshot.formatted[0])
+        if self.status_text.toPlainText() != status:
+            self.status_text.setText(status)
 
     def copy_to_clipboard(self):
-        times = [digital.text() + f" ({tz})" for digital, _ in self.clocks for tz in self.timezones]
+        snapshot = self.clock_snapshot or self.clock_board.snapshot()
+        times = [f"{text} ({tz})" for tz, text in zip(snapshot.zones, snapshot.formatted)]
         if times:
             QApplication.clipboard().setText("\n".join(times))
-            self.status_text.setText(self.texts[self.current_lang]['status_updated'].format(time="Times copied to clipboard"))
-
-    def update_calendar(self):
-        for i in reversed(range(self.gregorian_grid.count())):
-            self.gregorian_grid.itemAt(i).widget().setParent(None)
-        for i in reversed(range(self.jalali_grid.count())):
-            self.jalali_grid.itemAt(i).widget().setParent(None)
-        for i in reversed(range(self.hijri_grid.count())):
-            self.hijri_grid.itemAt(i).widget().setParent(None)
-
-        try:
-            self.current_year = int(self.year_input.text())
-        except ValueError:
-            self.current_year = datetime.now().year
-            self.year_input.setText(str(self.current_year))
-
-        self.current_month = max(1, min(12, self.month_combo.currentIndex() + 1))
-
-        headers = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat']
-        if self.current_lang == 'fa':
-            headers = ['یک‌شنبه', 'دوشنبه', 'سه‌شنبه', 'چهارشنبه', 'پنج‌شنبه', 'جمعه', 'شنبه']
-        elif self.current_lang == 'zh':
-            headers = ['周日', '周一', '周二', '周三', '周四', '周五', '周六']
-        elif self.current_lang == 'ru':
-            headers = ['Вс', 'Пн', 'Вт', 'Ср', 'Чт', 'Пт', 'Сб']
-
-        for col, header in enumerate(headers):
-            for grid, title in [
-                (self.gregorian_grid, self.texts[self.current_lang]['gregorian']),
-                (self.jalali_grid, self.texts[self.current_lang]['jalali']),
-                (self.hijri_grid, self.texts[self.current_lang]['hijri'])
-            ]:
-                if col == 0:
-                    title_label = QLabel(title)
-                    title_label.setStyleSheet("font-weight: bold; font-size: 16px; padding: 5px; color: black;")
-                    title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    grid.addWidget(title_label, 0, 0, 1, 7)
-                label = QLabel(header)
-                label.setStyleSheet("font-weight: bold; font-size: 14px; padding: 5px; color: black;")
+            self.status_text.setText(self.catalog['status_updated'].format(time="Times copied to clipboard"))
+
+    def init_calendar_cells(self):
+        self.calendar_cells = {}
+        for system, grid, container in [
+            ('gregorian', self.gregorian_grid, self.gregorian_container),
+            ('jalali', self.jalali_grid, self.jalali_container),
+            ('hijri', self.hijri_grid, self.hijri_container)
+        ]:
+            title_label = QLabel(container)
+            title_label.setProperty('cellRole', 'title')
+            title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            grid.addWidget(title_label, 0, 0, 1, 7)
+            headers = []
+            for col in range(7):
+                label = QLabel(container)
+                label.setProperty('cellRole', 'header')
                 label.setAlignment(Qt.AlignmentFlag.AlignCenter)
                 grid.addWidget(label, 1, col)
-
-        try:
-            # Gregorian Calendar
-            cal = calendar.monthcalendar(self.current_year, self.current_month)
-            for week, days in enumerate(cal):
-                for day, day_num in enumerate(days):
-                    label = QLabel(str(day_num) if day_num != 0 else "")
+                headers.append(label)
+            days = []
+            for week in range(6):
+                row = []
+                for day in range(7):
+                    label = QLabel(container)
                     label.setFixedSize(50, 50)
                     label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    if day_num != 0:
-                        if (self.current_month, day_num) in self.holidays['gregorian']:
-                            label.setStyleSheet(f"""
-                                QLabel {{
-                                    border-radius: 8px;
-                                    font-size: 14px;
-                                    background: {self.themes[self.current_theme]['calendar_holiday'].name()};
-                                    color: black;
-                                }}
-                            """)
-                        else:
-                            label.setStyleSheet("""
-                                QLabel {
-                                    border-radius: 8px;
-                                    font-size: 14px;
-                                    background: rgba(255, 255, 255, 0.95);
-                                    color: black;
-                                }
-                            """)
-                    self.gregorian_grid.addWidget(label, week + 2, day)
-        except ValueError:
-            self.status_text.setText("Invalid date for Gregorian calendar")
+                    label.setProperty('dayState', 'empty')
+                    label.setProperty('today', False)
+                    label.setVisible(False)
+                    grid.addWidget(label, week + 2, day)
+                    row.append(label)
+                days.append(row)
+            self.calendar_cells[system] = {'title': title_label, 'headers': headers, 'days': days}
+
+    def fill_calendar_grid(self, system, grid):
+        if system in self.rendered_grids and self.rendered_grids[system] is grid:
+            return
+        self.rendered_grids[system] = grid
+        weeks = grid.weeks if grid is not None else ()
+        for week, row in enumerate(self.calendar_cells[system]['days']):
+            for day, label in enumerate(row):
+                if week >= len(weeks):
+                    label.setVisible(False)
+                    continue
+                day_num = weeks[week][day]
+                if day_num == 0:
+                    state = 'empty'
+                elif grid.is_holiday(day_num):
+                    state = 'holiday'
+                else:
+                    state = 'normal'
+                today = grid.is_today(day_num)
+                label.setText(str(day_num) if day_num != 0 else "")
+                label.setToolTip('\n'.join(grid.holidays.get(day_num, ())))
+                if label.property('dayState') != state or label.property('today') != today:
+                    label.setProperty('dayState', state)
+                    label.setProperty('today', today)
+                    label.style().unpolish(label)
+                    label.style().polish(label)
+                label.setVisible(True)
 
-        try:
-            # Jalali Calendar
-            j_date = self.gregorian_to_jalali(self.current_year, self.current_month, 1)
-            j_year, j_month, j_day = j_date
-            days_in_month = self.days_in_jalali_month(j_year, j_month)
-            first_day = self.jalali_weekday(j_year, j_month, 1)
-            weeks = []
-            current_week = [0] * first_day
-            for day in range(1, days_in_month + 1):
-                if len(current_week) == 7:
-                    weeks.append(current_week)
-                    current_week = []
-                current_week.append(day)
-            if current_week:
-                current_week.extend([0] * (7 - len(current_week)))
-                weeks.append(current_week)
-            for week, days in enumerate(weeks):
-                for day, day_num in enumerate(days):
-                    label = QLabel(str(day_num) if day_num != 0 else "")
-                    label.setFixedSize(50, 50)
-                    label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    if day_num != 0:
-                        if (j_month, day_num) in self.holidays['jalali']:
-                            label.setStyleSheet(f"""
-                                QLabel {{
-                                    border-radius: 8px;
-                                    font-size: 14px;
-                                    background: {self.themes[self.current_theme]['calendar_holiday'].name()};
-                                    color: black;
-                                }}
-                            """)
-                        else:
-                            label.setStyleSheet("""
-                                QLabel {
-                                    border-radius: 8px;
-                                    font-size: 14px;
-                                    background: rgba(255, 255, 255, 0.95);
-                                    color: black;
-                                }
-                            """)
-                    self.jalali_grid.addWidget(label, week + 2, day)
-        except ValueError:
-            self.status_text.setText("Invalid date for Jalali calendar")
+    def update_calendar(self):
+        if self.year_input.hasAcceptableInput():
+            self.current_year = int(self.year_input.text())
 
-        try:
-            # Hijri Calendar
-            h_date = self.gregorian_to_hijri(self.current_year, self.current_month, 1)
-            h_year, h_month, h_day = h_date
-            days_in_month = self.days_in_hijri_month(h_year, h_month)
-            first_day = self.hijri_weekday(h_year, h_month, 1)
-            weeks = []
-            current_week = [0] * first_day
-            for day in range(1, days_in_month + 1):
-                if len(current_week) == 7:
-                    weeks.append(current_week)
-                    current_week = []
-                current_week.append(day)
-            if current_week:
-                current_week.extend([0] * (7 - len(current_week)))
-                weeks.append(current_week)
-            for week, days in enumerate(weeks):
-                for day, day_num in enumerate(days):
-                    label = QLabel(str(day_num) if day_num != 0 else "")
-                    label.setFixedSize(50, 50)
-                    label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    if day_num != 0:
-                        if (h_month, day_num) in self.holidays['hijri']:
-                            label.setStyleSheet(f"""
-                                QLabel {{
-                                    border-radius: 8px;
-                                    font-size: 14px;
-                                    background: {self.themes[self.current_theme]['calendar_holiday'].name()};
-                                    color: black;
-                                }}
-                            """)
-                        else:
-                            label.setStyleSheet("""
-                                QLabel {
-                                    border-radius: 8px;
-                                    font-size: 14px;
-                                    background: rgba(255, 255, 255, 0.95);
-                                    color: black;
-                                }
-                            """)
-                    self.hijri_grid.addWidget(label, week + 2, day)
-        except ValueError:
-            self.status_text.setText("Invalid date for Hijri calendar")
+        self.current_month = max(1, min(12, self.month_combo.currentIndex() + 1))
+
+        for system, name in [('gregorian', 'Gregorian'), ('jalali', 'Jalali'), ('hijri', 'Hijri')]:
+            try:
+                # Each view shows the month that contains the 1st of the
+                # selected Gregorian month.
+                first_ordinal = date(self.current_year, self.current_month, 1).toordinal()
+                grid = self.month_grids.containing(system, first_ordinal, WEEK_START)
+            except ValueError:
+                self.fill_calendar_grid(system, None)
+                # The status line lives on the clock tab, which may not be built yet.
+                if 'clock' in self.built_tabs:
+                    self.status_text.setText(f"Invalid date for {name} calendar")
+                continue
+            self.fill_calendar_grid(system, grid)
 
     def add_to_history(self, timezone, removed=False):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        for i, tz in enumerate(self.timezones):
-            current_time = datetime.now(pytz.timezone(tz))
-            format_str = "%I:%M:%S %p" if self.time_format == '12' else "%H:%M:%S"
-            time_str = current_time.strftime(format_str)
-            self.history.append({
-                'time': time_str,
+        from time_service import TIME_FORMATS
+        snapshot = self.clock_board.snapshot()
+        timestamp = snapshot.instant.astimezone().strftime("%Y-%m-%d %H:%M:%S")
+        # History keeps seconds whatever the display precision.
+        time_format = TIME_FORMATS[self.time_format]
+        entries = []
+        for tz, local_time in zip(snapshot.zones, snapshot.local_times):
+            entries.append({
+                'time': local_time.strftime(time_format),
                 'timezone': tz,
                 'date': timestamp,
                 'action': 'Removed' if removed and tz == timezone else 'Added' if tz == timezone else 'Updated'
             })
-        self.save_history()
-        self.update_history_ui()
-
-    def save_history(self):
-        with open('calendar_clock_history.json', 'w', encoding='utf-8') as f:
-            json.dump(self.history, f, ensure_ascii=False, indent=4)
+        self.history_store.append(entries)
+        if 'history' in self.built_tabs:
+            self.history_model.append_entries(entries)
 
     def load_history(self):
-        try:
-            with open('calendar_clock_history.json', 'r', encoding='utf-8') as f:
-                self.history = json.load(f)
-        except FileNotFoundError:
-            self.history = []
+        self.history, self.history_start = self.history_store.read_page(count=HISTORY_PAGE_SIZE)
+
+    def load_older_history(self):
+        if self.history_start <= 0:
+            return
+        entries, self.history_start = self.history_store.read_page(self.history_start, HISTORY_PAGE_SIZE)
+        scrollbar = self.history_view.verticalScrollBar()
+        position = scrollbar.value()
+        self.history_model.prepend_entries(entries)
+        self.history_view.updateGeometries()
+        scrollbar.setValue(position + len(entries))
+
+    def on_history_scrolled(self, value):
+        if value == self.history_view.verticalScrollBar().minimum() and self.history_scrolled:
+            self.load_older_history()
+
+    def on_tab_changed(self, index):
+        self.ensure_tab_built(self.tab_names[index])
+        self.update_tick_schedule()
+        if self.tab_names[index] == 'settings' and profiler.enabled:
+            self.update_profiler_view()
+        if self.tabs.widget(index) is self.history_tab and not self.history_scrolled:
+            self.history_view.scrollToBottom()
+            self.history_scrolled = True
 
     def save_history_to_file(self):
-        file_path, _ = QFileDialog.getSaveFileName(self, self.texts[self.current_lang]['save_history'], "", "JSON Files (*.json)")
+        file_path, _ = QFileDialog.getSaveFileName(self, self.catalog['save_history'], "", "JSON Files (*.json)")
         if file_path:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.history, f, ensure_ascii=False, indent=4)
-            self.status_text.setText(self.texts[self.current_lang]['status_updated'].format(time="History saved to file"))
+            self.history_store.sync()
+            self.history_store.export_json(file_path)
+            self.status_text.setText(self.catalog['status_updated'].format(time="History saved to file"))
 
     def update_history_ui(self):
-        for i in reversed(range(self.history_grid.count())):
-            self.history_grid.itemAt(i).widget().setParent(None)
-
+        if 'history' not in self.built_tabs:
+            return
         headers = [
-            self.texts[self.current_lang]['history_time'],
-            self.texts[self.current_lang]['history_timezone'],
-            self.texts[self.current_lang]['history_date'],
-            self.texts[self.current_lang]['history_action']
+            self.catalog['history_time'],
+            self.catalog['history_timezone'],
+            self.catalog['history_date'],
+            self.catalog['history_action']
         ]
-        for col, header in enumerate(headers):
-            label = QLabel(header)
-            label.setStyleSheet("font-weight: bold; font-size: 14px; padding: 5px; color: black;")
-            label.setAlignment(Qt.AlignmentFlag.AlignRight if self.current_lang == 'fa' else Qt.AlignmentFlag.AlignLeft)
-            self.history_grid.addWidget(label, 0, col)
-
-        for row, item in enumerate(self.history, 1):
-            time_label = QLabel(item['time'])
-            timezone_label = QLabel(item['timezone'])
-            date_label = QLabel(item['date'])
-            action_label = QLabel(item['action'])
-            
-            for label in [time_label, timezone_label, date_label, action_label]:
-                label.setStyleSheet("font-size: 12px; padding: 5px; border-bottom: 1px solid rgba(0, 0, 0, 0.1); color: black;")
-                label.setWordWrap(True)
-                label.setAlignment(Qt.AlignmentFlag.AlignRight if self.current_lang == 'fa' else Qt.AlignmentFlag.AlignLeft)
-            
-            self.history_grid.addWidget(time_label, row, 0)
-            self.history_grid.addWidget(timezone_label, row, 1)
-            self.history_grid.addWidget(date_label, row, 2)
-            self.history_grid.addWidget(action_label, row, 3)
+        self.history_model.set_headers(headers, Qt.AlignmentFlag.AlignRight if self.current_lang == 'fa' else Qt.AlignmentFlag.AlignLeft)
 
     def clear_history(self):
-        self.history = []
-        self.save_history()
-        self.update_history_ui()
+        self.history_store.clear()
+        self.history_start = 0
+        self.history_model.clear()
+
+    def compact_history(self):
+        try:
+            if os.path.getsize(self.history_store.path) > HISTORY_COMPACT_BYTES:
+                self.history_store.compact(HISTORY_KEEP_ENTRIES)
+        except OSError:
+            pass
+
+    def closeEvent(self, event):
+        self.history_store.close()
+        self.compact_history()
+        trace_path = os.environ.get('CALENDAR_CLOCK_PROFILE_TRACE')
+        if trace_path and profiler.enabled:
+            self.dump_profile(trace_path)
+        super().closeEvent(event)
+
+
+profiler.instrument(ClockWidget, ['paintEvent'])
+profiler.instrument(CalendarClockApp, ['update_clocks', 'update_calendar', 'update_history_ui', 'add_to_history',
+                                       'apply_theme'])
+profiler.instrument(HistoryStore, ['append', 'sync'])
 
 if __name__ == '__main__':
+    if os.environ.get('CALENDAR_CLOCK_PROFILE') or os.environ.get('CALENDAR_CLOCK_PROFILE_TRACE'):
+        profiler.enable()
     app = QApplication(sys.argv)
     app.setStyle('Windows')
     window = CalendarClockApp()
     window.show()
+    window.mark_startup('show')
+    if os.environ.get('CALENDAR_CLOCK_STARTUP_TIMINGS'):
+        print(json.dumps(window.startup_timings), file=sys.stderr)
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,548 @@
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from datetime import date
+
+np = None
+
+GREGORIAN_DAYS_BEFORE_MONTH = [0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334]
+GREGORIAN_MONTH_DAYS = [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+GREGORIAN_LEAP_MONTH_DAYS = [0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+
+def is_gregorian_leap(gy):
+    return (gy % 4 == 0 and gy % 100 != 0) or (gy % 400 == 0)
+
+
+def gregorian_to_jalali(gy, gm, gd):
+    g_d_m = GREGORIAN_DAYS_BEFORE_MONTH
+    if gy > 1600:
+        jy = 979
+        gy -= 1600
+    else:
+        jy = 0
+        gy -= 621
+    if gm > 2:
+        gy2 = gy + 1
+    else:
+        gy2 = gy
+    days = (365 * gy) + (int((gy2 + 3) / 4)) - (int((gy2 + 99) / 100)) + (int((gy2 + 399) / 400)) - 80 + gd + g_d_m[gm - 1]
+    jy += 33 * (int(days / 12053))
+    days %= 12053
+    jy += 4 * (int(days / 1461))
+    days %= 1461
+    if days > 365:
+        jy += int((days - 1) / 365)
+        days = (days - 1) % 365
+    if days < 186:
+        jm = 1 + int(days / 31)
+        jd = 1 + (days % 31)
+    else:
+        jm = 7 + int((days - 186) / 30)
+        jd = 1 + ((days - 186) % 30)
+    return [jy, jm, jd]
+
+
+def gregorian_to_hijri(gy, gm, gd):
+    d = date(gy, gm, gd)
+    jd = int((d - date(1, 1, 1)).days + 2)
+    z = jd + 1721424
+    l = z - 1948440
+    n = int((l - 1) / 10631)
+    l = l - 10631 * n + 354
+    j = (int((10985 - l) / 5316)) * (int((50 * l) / 17719)) + (int(l / 5670)) * (int((43 * l) / 15238))
+    l = l - (int((30 - j) / 15)) * (int((17719 * j) / 50)) - (int(j / 16)) * (int((15238 * j) / 43)) + 29
+    hy = 30 * n + j - 30
+    hm = l
+    hd = z - (355 * n + 355 * j + (int((l + 1) / 30)) * 30 + l) + 1948440 - 1
+    return [hy, hm, hd]
+
+
+def days_in_jalali_month(jy, jm):
+    if jm <= 6:
+        return 31
+    elif jm <= 11:
+        return 30
+    else:
+        return 29 if (jy % 33) % 4 == 1 else 30
+
+
+def days_in_hijri_month(hy, hm):
+    if hm in [1, 3, 5, 7, 8, 10, 12]:
+        return 30
+    elif hm == 2:
+        return 29 if (hy % 30) % 2 == 1 else 28
+    else:
+        return 29
+
+
+def jalali_weekday(jy, jm, jd):
+    g_date = jalali_to_gregorian(jy, jm, jd)
+    return date(g_date[0], g_date[1], g_date[2]).weekday()
+
+
+def hijri_weekday(hy, hm, hd):
+    g_date = hijri_to_gregorian(hy, hm, hd)
+    return date(g_date[0], g_date[1], g_date[2]).weekday()
+
+
+def jalali_to_gregorian(jy, jm, jd):
+    if jy > 979:
+        gy = 1600
+        jy -= 979
+    else:
+        gy = 621
+    if jm < 7:
+        days = (jm - 1) * 31
+    else:
+        days = ((jm - 7) * 30) + 186
+    days += 365 * jy + (int(jy / 33)) * 8 + (int(((jy % 33) + 3) / 4)) + 78 + jd
+    gy += 400 * (int(days / 146097))
+    days %= 146097
+    if days > 36524:
+        gy += 100 * (int(days / 36524))
+        days %= 36524
+        if days >= 365:
+            days += 1
+    gy += 4 * (int(days / 1461))
+    days %= 1461
+    if days > 365:
+        gy += int((days - 1) / 365)
+        days = (days - 1) % 365
+    gd = days + 1
+    return _split_day_of_year(gy, gd)
+
+
+def hijri_to_gregorian(hy, hm, hd):
+    jd = hd + (int((29 * (hm - 1) + 13) / 30)) + 355 * (hy % 30) + 10631 * (int(hy / 30)) + 1948439
+    z = jd - 1721424
+    w = int((z - 0.5) / 146097)
+    z = z - w * 146097
+    x = int((z - 0.5) / 36524)
+    if x == 4:
+        x = 3
+    z = z - x * 36524
+    y = int((z - 0.5) / 1461)
+    z = z - y * 1461
+    n = int((z - 0.5) / 365)
+    z = z - n * 365
+    gy = 400 * w + 100 * x + 4 * y + n
+    gd = z
+    return _split_day_of_year(gy, gd)
+
+
+def _split_day_of_year(gy, gd):
+    if is_gregorian_leap(gy):
+        g_d_m = GREGORIAN_LEAP_MONTH_DAYS
+    else:
+        g_d_m = GREGORIAN_MONTH_DAYS
+    gm = 0
+    while gm < 13 and gd > g_d_m[gm]:
+        gd -= g_d_m[gm]
+        gm += 1
+    return [gy, gm, gd]
+
+
+# Batch conversions. Every array function below mirrors the scalar routine
+# above step by step (including int() truncation toward zero and Python's
+# floor modulo) so a column converts to exactly what a per-row loop gives.
+
+def _require_numpy():
+    # NumPy is imported on first batch call so the GUI and scalar API do not
+    # pay for it at startup.
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("NumPy is required for batch calendar conversions")
+        np = numpy
+
+
+def _as_int_array(values):
+    return np.asarray(values, dtype=np.int64)
+
+
+def _tdiv(a, b):
+    # Same result as int(a / b) on Python numbers: true division in double
+    # precision, then truncation toward zero.
+    return np.trunc(np.true_divide(a, b)).astype(np.int64)
+
+
+_CUMULATIVE_MONTH_DAYS = None
+
+
+def _cumulative_month_days():
+    global _CUMULATIVE_MONTH_DAYS
+    if _CUMULATIVE_MONTH_DAYS is None:
+        _CUMULATIVE_MONTH_DAYS = (
+            np.cumsum(GREGORIAN_MONTH_DAYS).astype(np.int64),
+            np.cumsum(GREGORIAN_LEAP_MONTH_DAYS).astype(np.int64),
+        )
+    return _CUMULATIVE_MONTH_DAYS
+
+
+def _is_gregorian_leap_batch(gy):
+    return ((gy % 4 == 0) & (gy % 100 != 0)) | (gy % 400 == 0)
+
+
+def _split_day_of_year_batch(gy, gd):
+    common, leap = _cumulative_month_days()
+    leap_year = _is_gregorian_leap_batch(gy)
+    gm = np.where(
+        leap_year,
+        np.searchsorted(leap, gd, side='left'),
+        np.searchsorted(common, gd, side='left'),
+    ).astype(np.int64)
+    consumed = np.where(leap_year, leap[np.maximum(gm - 1, 0)], common[np.maximum(gm - 1, 0)])
+    gd = np.where(gm > 0, gd - consumed, gd)
+    return gy, gm, gd
+
+
+def gregorian_to_jalali_batch(gy, gm, gd):
+    _require_numpy()
+    gy, gm, gd = np.broadcast_arrays(_as_int_array(gy), _as_int_array(gm), _as_int_array(gd))
+    g_d_m = np.asarray(GREGORIAN_DAYS_BEFORE_MONTH, dtype=np.int64)
+    modern = gy > 1600
+    jy = np.where(modern, 979, 0).astype(np.int64)
+    gy = np.where(modern, gy - 1600, gy - 621)
+    gy2 = np.where(gm > 2, gy + 1, gy)
+    days = (365 * gy) + _tdiv(gy2 + 3, 4) - _tdiv(gy2 + 99, 100) + _tdiv(gy2 + 399, 400) - 80 + gd + g_d_m[gm - 1]
+    jy = jy + 33 * _tdiv(days, 12053)
+    days = days % 12053
+    jy = jy + 4 * _tdiv(days, 1461)
+    days = days % 1461
+    over = days > 365
+    jy = np.where(over, jy + _tdiv(days - 1, 365), jy)
+    days = np.where(over, (days - 1) % 365, days)
+    first_half = days < 186
+    jm = np.where(first_half, 1 + _tdiv(days, 31), 7 + _tdiv(days - 186, 30))
+    jd = np.where(first_half, 1 + (days % 31), 1 + ((days - 186) % 30))
+    return jy, jm, jd
+
+
+def jalali_to_gregorian_batch(jy, jm, jd):
+    _require_numpy()
+    jy, jm, jd = np.broadcast_arrays(_as_int_array(jy), _as_int_array(jm), _as_int_array(jd))
+    modern = jy > 979
+    gy = np.where(modern, 1600, 621).astype(np.int64)
+    jy = np.where(modern, jy - 979, jy)
+    days = np.where(jm < 7, (jm - 1) * 31, ((jm - 7) * 30) + 186)
+    days = days + 365 * jy + _tdiv(jy, 33) * 8 + _tdiv((jy % 33) + 3, 4) + 78 + jd
+    gy = gy + 400 * _tdiv(days, 146097)
+    days = days % 146097
+    century = days > 36524
+    gy = np.where(century, gy + 100 * _tdiv(days, 36524), gy)
+    days = np.where(century, days % 36524, days)
+    days = np.where(century & (days >= 365), days + 1, days)
+    gy = gy + 4 * _tdiv(days, 1461)
+    days = days % 1461
+    over = days > 365
+    gy = np.where(over, gy + _tdiv(days - 1, 365), gy)
+    days = np.where(over, (days - 1) % 365, days)
+    return _split_day_of_year_batch(gy, days + 1)
+
+
+def gregorian_to_ordinal_batch(gy, gm, gd):
+    _require_numpy()
+    gy, gm, gd = np.broadcast_arrays(_as_int_array(gy), _as_int_array(gm), _as_int_array(gd))
+    _validate_gregorian_batch(gy, gm, gd)
+    leap_year = _is_gregorian_leap_batch(gy)
+    g_d_m = np.asarray(GREGORIAN_DAYS_BEFORE_MONTH, dtype=np.int64)
+    y = gy - 1
+    return y * 365 + y // 4 - y // 100 + y // 400 + g_d_m[gm - 1] + ((gm > 2) & leap_year) + gd
+
+
+def _validate_gregorian_batch(gy, gm, gd):
+    if not gy.size:
+        return
+    if gy.min() < 1 or gy.max() > 9999:
+        raise ValueError("year is out of range")
+    if gm.min() < 1 or gm.max() > 12:
+        raise ValueError("month must be in 1..12")
+    if not gregorian_valid_batch(gy, gm, gd).all():
+        raise ValueError("day is out of range for month")
+
+
+def gregorian_valid_batch(gy, gm, gd):
+    """Boolean mask of the (gy, gm, gd) triples that are real dates."""
+    _require_numpy()
+    gy, gm, gd = np.broadcast_arrays(_as_int_array(gy), _as_int_array(gm), _as_int_array(gd))
+    valid = (gy >= 1) & (gy <= 9999) & (gm >= 1) & (gm <= 12)
+    safe_month = np.where(valid, gm, 1)
+    month_days = np.where(
+        _is_gregorian_leap_batch(gy),
+        np.asarray(GREGORIAN_LEAP_MONTH_DAYS, dtype=np.int64)[safe_month],
+        np.asarray(GREGORIAN_MONTH_DAYS, dtype=np.int64)[safe_month],
+    )
+    return valid & (gd >= 1) & (gd <= month_days)
+
+
+def ordinal_to_gregorian_batch(ordinals):
+    _require_numpy()
+    n = _as_int_array(ordinals) - 1
+    n400, n = np.divmod(n, 146097)
+    n100, n = np.divmod(n, 36524)
+    n4, n = np.divmod(n, 1461)
+    n1, n = np.divmod(n, 365)
+    gy = n400 * 400 + n100 * 100 + n4 * 4 + n1 + 1
+    # The last day of a 4- or 400-year cycle is Dec 31 of the previous year.
+    cycle_end = (n1 == 4) | (n100 == 4)
+    gy = np.where(cycle_end, gy - 1, gy)
+    day_of_year = np.where(cycle_end, 366, n + 1)
+    return _split_day_of_year_batch(gy, day_of_year)
+
+
+def gregorian_to_hijri_batch(gy, gm, gd):
+    return ordinal_to_hijri_batch(gregorian_to_ordinal_batch(gy, gm, gd))
+
+
+def ordinal_to_hijri_batch(ordinals):
+    _require_numpy()
+    z = _as_int_array(ordinals) + 1721425
+    l = z - 1948440
+    n = _tdiv(l - 1, 10631)
+    l = l - 10631 * n + 354
+    j = _tdiv(10985 - l, 5316) * _tdiv(50 * l, 17719) + _tdiv(l, 5670) * _tdiv(43 * l, 15238)
+    l = l - _tdiv(30 - j, 15) * _tdiv(17719 * j, 50) - _tdiv(j, 16) * _tdiv(15238 * j, 43) + 29
+    hy = 30 * n + j - 30
+    hm = l
+    hd = z - (355 * n + 355 * j + _tdiv(l + 1, 30) * 30 + l) + 1948440 - 1
+    return hy, hm, hd
+
+
+def hijri_to_gregorian_batch(hy, hm, hd):
+    _require_numpy()
+    hy, hm, hd = np.broadcast_arrays(_as_int_array(hy), _as_int_array(hm), _as_int_array(hd))
+    jd = hd + _tdiv(29 * (hm - 1) + 13, 30) + 355 * (hy % 30) + 10631 * _tdiv(hy, 30) + 1948439
+    z = jd - 1721424
+    w = _tdiv(z - 0.5, 146097)
+    z = z - w * 146097
+    x = _tdiv(z - 0.5, 36524)
+    x = np.where(x == 4, 3, x)
+    z = z - x * 36524
+    y = _tdiv(z - 0.5, 1461)
+    z = z - y * 1461
+    n = _tdiv(z - 0.5, 365)
+    z = z - n * 365
+    gy = 400 * w + 100 * x + 4 * y + n
+    return _split_day_of_year_batch(gy, z)
+
+
+def ordinal_to_jalali_batch(ordinals):
+    return gregorian_to_jalali_batch(*ordinal_to_gregorian_batch(ordinals))
+
+
+def jalali_to_ordinal_batch(jy, jm, jd):
+    return gregorian_to_ordinal_batch(*jalali_to_gregorian_batch(jy, jm, jd))
+
+
+def hijri_to_ordinal_batch(hy, hm, hd):
+    return gregorian_to_ordinal_batch(*hijri_to_gregorian_batch(hy, hm, hd))
+
+
+def weekday_batch(ordinals):
+    # Monday == 0, matching date.weekday().
+    _require_numpy()
+    return (_as_int_array(ordinals) + 6) % 7
+
+
+def days_in_jalali_month_batch(jy, jm):
+    _require_numpy()
+    jy, jm = np.broadcast_arrays(_as_int_array(jy), _as_int_array(jm))
+    esfand = np.where((jy % 33) % 4 == 1, 29, 30)
+    return np.where(jm <= 6, 31, np.where(jm <= 11, 30, esfand))
+
+
+def days_in_hijri_month_batch(hy, hm):
+    _require_numpy()
+    hy, hm = np.broadcast_arrays(_as_int_array(hy), _as_int_array(hm))
+    safar = np.where((hy % 30) % 2 == 1, 29, 28)
+    full = np.isin(hm, [1, 3, 5, 7, 8, 10, 12])
+    return np.where(full, 30, np.where(hm == 2, safar, 29))
+
+
+# Month-start lookup tables. Each table stores the date ordinal (as used by
+# date.toordinal()) of day 1 of every month in a span of years, plus one
+# sentinel for the month after the span, in a flat array of 32-bit ints.
+# Saved tables hold the same ints little-endian, whatever the platform.
+
+ISLAMIC_EPOCH = 227015
+MONTH_TABLE_MAGIC = b'CCMT'
+MONTH_TABLE_VERSION = 2
+MONTH_TABLE_TYPECODE = 'i'
+MONTH_TABLE_HEADER = struct.Struct('<4sH8sii')
+
+
+def jalali_new_year_ordinal(jy):
+    # Nowruz falls on March 19-22, so the scan takes at most three steps.
+    if jy < 1:
+        raise ValueError(f"Jalali year {jy} is out of range")
+    o = date(jy + 621, 3, 19).toordinal()
+    for _ in range(4):
+        if gregorian_to_jalali(*_ordinal_to_ymd(o)) == [jy, 1, 1]:
+            return o
+        o += 1
+    raise ValueError(f"No Nowruz found for Jalali year {jy}")
+
+
+def hijri_month_start_ordinal(hy, hm):
+    # Arithmetical (tabular) Islamic calendar, 30-year cycle with leap years
+    # 2, 5, 7, 10, 13, 16, 18, 21, 24, 26 and 29.
+    return 29 * (hm - 1) + (6 * hm - 1) // 11 + (hy - 1) * 354 + (3 + 11 * hy) // 30 + ISLAMIC_EPOCH
+
+
+def _ordinal_to_ymd(o):
+    d = date.fromordinal(o)
+    return d.year, d.month, d.day
+
+
+def _jalali_month_starts(first_year, last_year):
+    starts = array(MONTH_TABLE_TYPECODE)
+    for jy in range(first_year, last_year + 1):
+        o = jalali_new_year_ordinal(jy)
+        for jm in range(12):
+            starts.append(o + (jm * 31 if jm < 6 else 186 + (jm - 6) * 30))
+    starts.append(jalali_new_year_ordinal(last_year + 1))
+    return starts
+
+
+def _hijri_month_starts(first_year, last_year):
+    starts = array(MONTH_TABLE_TYPECODE)
+    for hy in range(first_year, last_year + 1):
+        for hm in range(1, 13):
+            starts.append(hijri_month_start_ordinal(hy, hm))
+    starts.append(hijri_month_start_ordinal(last_year + 1, 1))
+    return starts
+
+
+class MonthStartTable:
+    builders = {
+        'jalali': _jalali_month_starts,
+        'hijri': _hijri_month_starts,
+    }
+
+    def __init__(self, system, first_year=1300, last_year=1600, path=None):
+        if system not in self.builders:
+            raise ValueError(f"Unknown calendar system: {system}")
+        if last_year < first_year:
+            raise ValueError("last_year must not be before first_year")
+        self.system = system
+        self.first_year = first_year
+        self.last_year = last_year
+        self.path = path
+        self._starts = None
+        self._starts_array = None
+
+    @property
+    def starts(self):
+        if self._starts is None:
+            self._starts = self._load() if self.path else None
+            if self._starts is None:
+                self._starts = self.builders[self.system](self.first_year, self.last_year)
+                if self.path:
+                    try:
+                        self.save(self.path)
+                    except OSError:
+                        pass
+        return self._starts
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                header = f.read(MONTH_TABLE_HEADER.size)
+                magic, version, system, first_year, last_year = MONTH_TABLE_HEADER.unpack(header)
+                if (magic, version, system.rstrip(b'\0').decode('ascii'), first_year, last_year) != (
+                        MONTH_TABLE_MAGIC, MONTH_TABLE_VERSION, self.system, self.first_year, self.last_year):
+                    return None
+                starts = array(MONTH_TABLE_TYPECODE)
+                starts.frombytes(f.read())
+                if sys.byteorder == 'big':
+                    starts.byteswap()
+        except (OSError, struct.error, UnicodeDecodeError, ValueError):
+            return None
+        if len(starts) != (self.last_year - self.first_year + 1) * 12 + 1:
+            return None
+        return starts
+
+    def save(self, path):
+        header = MONTH_TABLE_HEADER.pack(MONTH_TABLE_MAGIC, MONTH_TABLE_VERSION, self.system.encode('ascii'),
+                                         self.first_year, self.last_year)
+        starts = array(MONTH_TABLE_TYPECODE, self.starts)
+        if sys.byteorder == 'big':
+            starts.byteswap()
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(starts.tobytes())
+        os.replace(temp_path, path)
+
+    def covers(self, ordinal):
+        starts = self.starts
+        return starts[0] <= ordinal < starts[-1]
+
+    def locate(self, ordinal):
+        if not self.covers(ordinal):
+            raise ValueError(f"Date ordinal {ordinal} is outside the {self.system} table span")
+        starts = self.starts
+        index = bisect_right(starts, ordinal) - 1
+        return [self.first_year + index // 12, index % 12 + 1, ordinal - starts[index] + 1]
+
+    def _index(self, year, month):
+        if not (self.first_year <= year <= self.last_year and 1 <= month <= 12):
+            raise ValueError(f"{self.system} month {year}-{month} is outside the table span")
+        return (year - self.first_year) * 12 + month - 1
+
+    def month_start(self, year, month):
+        return self.starts[self._index(year, month)]
+
+    def month_length(self, year, month):
+        index = self._index(year, month)
+        return self.starts[index + 1] - self.starts[index]
+
+    def month_weekday(self, year, month):
+        return (self.month_start(year, month) + 6) % 7
+
+    def to_ordinal(self, year, month, day):
+        return self.month_start(year, month) + day - 1
+
+    def starts_array(self):
+        _require_numpy()
+        if self._starts_array is None:
+            self._starts_array = np.asarray(self.starts, dtype=np.int64)
+        return self._starts_array
+
+    def locate_batch(self, ordinals):
+        starts = self.starts_array()
+        ordinals = _as_int_array(ordinals)
+        if ordinals.size and (ordinals.min() < starts[0] or ordinals.max() >= starts[-1]):
+            raise ValueError(f"Date ordinals are outside the {self.system} table span")
+        index = np.searchsorted(starts, ordinals, side='right') - 1
+        return self.first_year + index // 12, index % 12 + 1, ordinals - starts[index] + 1
+
+    def valid_batch(self, year, month, day):
+        """Boolean mask of the (year, month, day) triples inside the table span."""
+        starts = self.starts_array()
+        year, month, day = np.broadcast_arrays(_as_int_array(year), _as_int_array(month), _as_int_array(day))
+        valid = (year >= self.first_year) & (year <= self.last_year) & (month >= 1) & (month <= 12)
+        index = np.where(valid, (year - self.first_year) * 12 + month - 1, 0)
+        return valid & (day >= 1) & (day <= starts[index + 1] - starts[index])
+
+    def to_ordinal_batch(self, year, month, day):
+        starts = self.starts_array()
+        year, month, day = np.broadcast_arrays(_as_int_array(year), _as_int_array(month), _as_int_array(day))
+        if not self.valid_batch(year, month, day).all():
+            raise ValueError(f"Dates are outside the {self.system} table span or invalid")
+        return starts[(year - self.first_year) * 12 + month - 1] + day - 1
+
+
+_month_tables = {}
+
+
+def month_table(system, first_year=1300, last_year=1600, path=None):
+    key = (system, first_year, last_year, path)
+    if key not in _month_tables:
+        _month_tables[key] = MonthStartTable(system, first_year, last_year, path)
+    return _month_tables[key]
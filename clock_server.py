@@ -0,0 +1,263 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import sys
+from datetime import MAXYEAR, MINYEAR, date
+from urllib.parse import parse_qs, urlsplit
+
+import calendar_engine
+from holiday_engine import CALENDAR_SYSTEMS, gregorian_year_bounds, load_holiday_index
+from month_grid import WEEK_START, MonthGrids
+from time_service import ClockBoard, next_tick_delay, system_timezone
+
+# Headless server mode (python calendar_clock_app.py --serve). Plain asyncio
+# streams serve a small JSON API over HTTP/1.1 and a WebSocket feed; one tick
+# loop encodes each second's snapshot once and writes the same frame to
+# every subscriber.
+
+WEBSOCKET_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+MAX_FRAME_SIZE = 1 << 16
+# Years each calendar can be queried for: the ones whose months fall inside
+# the date range Python supports.
+YEAR_SPANS = {
+    'gregorian': (MINYEAR, MAXYEAR),
+    'jalali': (1, 9377),
+    'hijri': (1, 9665),
+}
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+
+def encode_frame(payload, opcode=0x1):
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def read_frame(reader):
+    first, second = await reader.readexactly(2)
+    length = second & 0x7f
+    if length == 126:
+        length, = struct.unpack('!H', await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack('!Q', await reader.readexactly(8))
+    if length > MAX_FRAME_SIZE:
+        raise ValueError("WebSocket frame too large")
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    return first & 0x0f, payload
+
+
+class ClockServer:
+    def __init__(self, zones, time_format='24', holidays_dir='calendar_clock_holidays', max_buffer=1 << 16):
+        self.board = ClockBoard(zones, time_format)
+        self.tables = {
+            'jalali': calendar_engine.month_table('jalali', path='calendar_clock_jalali_months.bin'),
+            'hijri': calendar_engine.month_table('hijri', path='calendar_clock_hijri_months.bin')
+        }
+        self.holidays = load_holiday_index(holidays_dir, self.tables)
+        self.grids = MonthGrids(self.holidays, self.tables)
+        self.max_buffer = max_buffer
+        self.subscribers = set()
+        self.last_frame = None
+        self.ticks = 0
+        self.server = None
+        self.tick_task = None
+
+    def time_payload(self):
+        snapshot = self.board.snapshot()
+        return {
+            'instant': snapshot.instant.timestamp(),
+            'utc': snapshot.instant.isoformat(),
+            'format': self.board.time_format,
+            'zones': snapshot.rows()
+        }
+
+    def check_year(self, system, year):
+        # Reject before any calendar arithmetic runs on the event loop.
+        if system not in CALENDAR_SYSTEMS:
+            raise ValueError(f"Unknown calendar system: {system}")
+        first, last = YEAR_SPANS[system]
+        if not first <= year <= last:
+            raise ValueError(f"{system} year must be between {first} and {last}")
+
+    def month_payload(self, system, year=None, month=None):
+        if year is not None:
+            self.check_year(system, year)
+        if month is not None and not 1 <= month <= 12:
+            raise ValueError("month must be between 1 and 12")
+        if year is None or month is None:
+            grid = self.grids.containing(system, date.today().toordinal(), WEEK_START)
+        else:
+            grid = self.grids.grid(system, year, month, WEEK_START)
+        # Weeks start on Sunday, matching the desktop grid's header row.
+        return {
+            'system': system,
+            'year': grid.year,
+            'month': grid.month,
+            'first_weekday': 'sunday',
+            'weeks': [list(week) for week in grid.weeks],
+            'today': grid.today,
+            'holidays': {str(day): list(names) for day, names in sorted(grid.holidays.items())}
+        }
+
+    def holidays_payload(self, system, year):
+        if system not in CALENDAR_SYSTEMS:
+            raise ValueError(f"Unknown calendar system: {system}")
+        # ``year`` is Gregorian whatever the calendar.
+        self.check_year('gregorian', year)
+        start, end = gregorian_year_bounds(year)
+        return {
+            'system': system,
+            'year': year,
+            'holidays': [{'date': date.fromordinal(ordinal).isoformat(), 'name': name}
+                         for ordinal, name in self.holidays.between(system, start, end)]
+        }
+
+    def route(self, path, query):
+        def number(name, default=None):
+            value = query.get(name)
+            return default if value is None else int(value)
+
+        if path == '/api/time':
+            return 200, self.time_payload()
+        if path == '/api/month':
+            return 200, self.month_payload(query.get('system', 'gregorian'), number('year'), number('month'))
+        if path == '/api/holidays':
+            return 200, self.holidays_payload(query.get('system', 'gregorian'), number('year', date.today().year))
+        if path == '/api/status':
+            return 200, {'subscribers': len(self.subscribers), 'ticks': self.ticks, 'zones': self.board.zones}
+        if path == '/':
+            return 200, {'endpoints': ['/api/time', '/api/month?system=&year=&month=',
+                                       '/api/holidays?system=&year=', '/api/status', '/ws']}
+        return 404, {'error': f"No route for {path}"}
+
+    async def handle(self, reader, writer):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+            request_line, *header_lines = head.decode('latin-1').split('\r\n')
+            method, target, _ = request_line.split(' ', 2)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            writer.close()
+            return
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(':')
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        url = urlsplit(target)
+        if url.path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+            await self.websocket(reader, writer, headers)
+            return
+        if method not in ('GET', 'HEAD'):
+            status, payload = 405, {'error': f"Method {method} not allowed"}
+        else:
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            try:
+                status, payload = self.route(url.path, query)
+            except (ValueError, KeyError, OverflowError) as e:
+                status, payload = 400, {'error': str(e)}
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     f"Access-Control-Allow-Origin: *\r\n"
+                     f"Connection: close\r\n\r\n".encode('latin-1'))
+        if method != 'HEAD':
+            writer.write(body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def websocket(self, reader, writer, headers):
+        key = headers.get('sec-websocket-key')
+        if not key:
+            writer.write(b"HTTP/1.1 400 Bad Request\r\nConnection: close\r\n\r\n")
+            writer.close()
+            return
+        accept = base64.b64encode(hashlib.sha1(key.encode('latin-1') + WEBSOCKET_GUID).digest())
+        writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                     b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+        writer.write(self.last_frame or self.encode_tick())
+        self.subscribers.add(writer)
+        try:
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == 0x8:
+                    writer.write(encode_frame(payload[:2], 0x8))
+                    break
+                if opcode == 0x9:
+                    writer.write(encode_frame(payload, 0xA))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    def encode_tick(self):
+        return encode_frame(json.dumps(self.time_payload(), ensure_ascii=False).encode('utf-8'))
+
+    def broadcast(self, frame):
+        for writer in list(self.subscribers):
+            # A client that stops reading is dropped instead of buffering
+            # ticks for it without bound.
+            if writer.transport.is_closing() or writer.transport.get_write_buffer_size() > self.max_buffer:
+                self.subscribers.discard(writer)
+                writer.transport.abort()
+            else:
+                writer.write(frame)
+
+    async def tick_loop(self):
+        while True:
+            await asyncio.sleep(next_tick_delay())
+            self.last_frame = self.encode_tick()
+            self.ticks += 1
+            self.broadcast(self.last_frame)
+
+    async def start(self, host='127.0.0.1', port=8765):
+        self.server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        self.tick_task = asyncio.create_task(self.tick_loop())
+        return self.server
+
+    async def serve_forever(self, host='127.0.0.1', port=8765):
+        server = await self.start(host, port)
+        for sock in server.sockets:
+            print(f"Serving on {sock.getsockname()}", file=sys.stderr, flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve clock and calendar data as JSON and WebSocket ticks.")
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--zones', default=None, help="Comma-separated timezone names (default: system timezone)")
+    parser.add_argument('--format', choices=['12', '24'], default='24')
+    parser.add_argument('--holidays', default='calendar_clock_holidays', help="Directory of holiday rule files")
+    args = parser.parse_args(argv)
+    zones = [zone.strip() for zone in args.zones.split(',') if zone.strip()] if args.zones else [system_timezone()]
+    try:
+        server = ClockServer(zones, args.format, args.holidays)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,393 @@
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import calendar_engine
+
+# Batch conversion of date columns between calendars:
+#
+#     python date_convert.py trades.csv trades_jalali.csv --column date --to jalali
+#
+# Input is read and written one chunk at a time. Each chunk is parsed,
+# converted through day ordinals and formatted with NumPy. Jalali and Hijri
+# dates go through calendar_engine's month-start tables, the same ones the
+# desktop grid uses. --jobs splits the input into record-aligned byte ranges
+# (CSV) or row groups (Parquet) that worker processes convert in parallel.
+
+SYSTEMS = ('gregorian', 'jalali', 'hijri')
+UNIX_EPOCH_ORDINAL = 719163
+DATE_WIDTH = 10
+np = None
+pa = None
+pq = None
+
+
+def _require_numpy():
+    global np
+    calendar_engine._require_numpy()
+    np = calendar_engine.np
+
+
+def _require_pyarrow():
+    global pa, pq
+    if pa is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("pyarrow is required for Parquet input and output")
+        pa, pq = pyarrow, pyarrow.parquet
+
+
+def parse_dates(values):
+    """Parse YYYY-MM-DD (or YYYY/MM/DD) strings into year, month, day and a validity mask."""
+    _require_numpy()
+    text = np.asarray(values, dtype=f'U{DATE_WIDTH + 1}')
+    codes = text.view(np.uint32).reshape(len(text), DATE_WIDTH + 1).astype(np.int64)
+    digits = codes - ord('0')
+    digit_columns = [0, 1, 2, 3, 5, 6, 8, 9]
+    valid = ((digits[:, digit_columns] >= 0) & (digits[:, digit_columns] <= 9)).all(axis=1)
+    separator = codes[:, 4]
+    valid &= ((separator == ord('-')) | (separator == ord('/'))) & (codes[:, 7] == separator)
+    valid &= codes[:, DATE_WIDTH] == 0
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 5] * 10 + digits[:, 6]
+    day = digits[:, 8] * 10 + digits[:, 9]
+    return year, month, day, valid
+
+
+def format_dates(year, month, day, valid):
+    """Format dates as YYYY-MM-DD strings; invalid rows become empty strings."""
+    _require_numpy()
+    codes = np.zeros((len(year), DATE_WIDTH), dtype=np.uint32)
+    for column, value, scale in ((0, year, 1000), (5, month, 10), (8, day, 10)):
+        value = np.where(valid, value, 0)
+        width = 4 if column == 0 else 2
+        for offset in range(width):
+            codes[:, column + offset] = ord('0') + (value // scale) % 10
+            scale //= 10
+    codes[:, 4] = ord('-')
+    codes[:, 7] = ord('-')
+    codes[~valid] = 0
+    return codes.view(f'U{DATE_WIDTH}').reshape(len(year))
+
+
+class DateConverter:
+    def __init__(self, source, target, first_year=None, last_year=None):
+        if source not in SYSTEMS or target not in SYSTEMS:
+            raise ValueError(f"Calendar systems must be one of {', '.join(SYSTEMS)}")
+        _require_numpy()
+        self.source = source
+        self.target = target
+        self.tables = {}
+        for system in {source, target} - {'gregorian'}:
+            if first_year is None and last_year is None:
+                table = calendar_engine.month_table(system, path=f'calendar_clock_{system}_months.bin')
+            else:
+                table = calendar_engine.month_table(system, first_year or 1300, last_year or 1600)
+            self.tables[system] = table
+
+    def to_ordinals(self, year, month, day, valid):
+        safe = (np.where(valid, year, 1), np.where(valid, month, 1), np.where(valid, day, 1))
+        if self.source == 'gregorian':
+            valid = valid & calendar_engine.gregorian_valid_batch(*safe)
+            safe = tuple(np.where(valid, part, 1) for part in safe)
+            return calendar_engine.gregorian_to_ordinal_batch(*safe), valid
+        table = self.tables[self.source]
+        valid = valid & table.valid_batch(*safe)
+        safe = tuple(np.where(valid, part, 1 if i else table.first_year) for i, part in enumerate(safe))
+        return table.to_ordinal_batch(*safe), valid
+
+    def from_ordinals(self, ordinals, valid):
+        if self.target == 'gregorian':
+            valid = valid & (ordinals >= 1) & (ordinals <= 3652059)
+            year, month, day = calendar_engine.ordinal_to_gregorian_batch(np.where(valid, ordinals, 1))
+            return year, month, day, valid
+        table = self.tables[self.target]
+        starts = table.starts_array()
+        valid = valid & (ordinals >= starts[0]) & (ordinals < starts[-1])
+        year, month, day = table.locate_batch(np.where(valid, ordinals, starts[0]))
+        return year, month, day, valid
+
+    def convert_strings(self, values):
+        """Convert date strings; returns (converted strings, number of unconvertible values)."""
+        ordinals, valid = self.to_ordinals(*parse_dates(values))
+        year, month, day, valid = self.from_ordinals(ordinals, valid)
+        return format_dates(year, month, day, valid), int((~valid).sum())
+
+    def convert_arrow(self, array):
+        """Convert a pyarrow string or date column; Gregorian output stays a date32 column."""
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        present = ~np.asarray(array.is_null().to_numpy(zero_copy_only=False), dtype=bool)
+        if pa.types.is_date(array.type) or pa.types.is_timestamp(array.type):
+            if self.source != 'gregorian':
+                raise ValueError("Date-typed columns can only be converted from the gregorian calendar")
+            days = array.cast(pa.date32(), safe=False).cast(pa.int32()).fill_null(0).to_numpy()
+            ordinals, valid = np.asarray(days, dtype=np.int64) + UNIX_EPOCH_ORDINAL, present
+        else:
+            values = np.asarray(array.fill_null('').to_numpy(zero_copy_only=False), dtype=str)
+            ordinals, valid = self.to_ordinals(*parse_dates(values))
+            valid &= present
+        if self.target == 'gregorian':
+            valid = valid & (ordinals >= 1) & (ordinals <= 3652059)
+            days = np.where(valid, ordinals - UNIX_EPOCH_ORDINAL, 0).astype(np.int32)
+            return pa.array(days, mask=~valid).cast(pa.date32()), int((present & ~valid).sum())
+        year, month, day, valid = self.from_ordinals(ordinals, valid)
+        values = pa.array(format_dates(year, month, day, valid), type=pa.string(), mask=~valid)
+        return values, int((present & ~valid).sum())
+
+
+def output_name(column, target, in_place):
+    return column if in_place else f'{column}_{target}'
+
+
+def iter_csv_records(path, start, end):
+    # A record is a run of lines holding an even number of quote characters,
+    # so a quoted field with an embedded newline stays in one record. Ranges
+    # start on record boundaries; a record that begins before ``end`` is read
+    # to its last line.
+    with open(path, 'rb') as f:
+        f.seek(start)
+        position = start
+        pending = []
+        quotes = 0
+        while position < end or pending:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            pending.append(line)
+            quotes += line.count(b'"')
+            if quotes % 2 == 0:
+                yield pending[0] if len(pending) == 1 else b''.join(pending)
+                pending = []
+                quotes = 0
+        if pending:
+            yield b''.join(pending)
+
+
+def csv_header(path, delimiter):
+    record = next(iter_csv_records(path, 0, os.path.getsize(path)), b'')
+    text = record.decode('utf-8-sig')
+    return next(csv.reader([text], delimiter=delimiter), []), len(record)
+
+
+def csv_ranges(path, start, jobs):
+    size = os.path.getsize(path)
+    if jobs <= 1 or start >= size:
+        return [(start, size)]
+    # Split points have to fall between records, which takes one pass over
+    # the lines to keep track of open quotes.
+    step = max(1, (size - start + jobs - 1) // jobs)
+    boundaries = [start]
+    with open(path, 'rb') as f:
+        f.seek(start)
+        position = start
+        quotes = 0
+        for line in f:
+            position += len(line)
+            quotes += line.count(b'"')
+            if quotes % 2 == 0 and position - boundaries[-1] >= step and position < size:
+                boundaries.append(position)
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def convert_csv_range(task):
+    (path, output, start, end, columns, source, target, years, in_place,
+     delimiter, chunk_size, header, write_header) = task
+    converter = DateConverter(source, target, *years)
+    indexes = [header.index(column) for column in columns]
+    rows_done = errors = 0
+    with open(output, 'w', encoding='utf-8', newline='') as out:
+        writer = csv.writer(out, delimiter=delimiter, lineterminator='\n')
+        if write_header:
+            writer.writerow(header + ([] if in_place else [output_name(c, target, False) for c in columns]))
+        records = iter_csv_records(path, start, end)
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                break
+            rows = list(csv.reader(io.StringIO(b''.join(chunk).decode('utf-8')), delimiter=delimiter))
+            converted = []
+            for index in indexes:
+                values, failed = converter.convert_strings(
+                    [row[index].strip() if index < len(row) else '' for row in rows])
+                converted.append(values.tolist())
+                errors += failed
+            if in_place:
+                for index, values in zip(indexes, converted):
+                    for row, value in zip(rows, values):
+                        if index < len(row):
+                            row[index] = value
+                writer.writerows(rows)
+            else:
+                writer.writerows(row + list(extra) for row, extra in zip(rows, zip(*converted)))
+            rows_done += len(rows)
+    return rows_done, errors
+
+
+def convert_csv(args, years):
+    header, body_start = csv_header(args.input, args.delimiter)
+    missing = [column for column in args.column if column not in header]
+    if missing:
+        raise ValueError(f"Columns not found in {args.input}: {', '.join(missing)}")
+    ranges = csv_ranges(args.input, body_start, args.jobs)
+    tasks = []
+    parts = []
+    for number, (start, end) in enumerate(ranges):
+        part = args.output if len(ranges) == 1 else f'{args.output}.part{number}'
+        parts.append(part)
+        tasks.append((args.input, part, start, end, args.column, args.source, args.target, years,
+                      args.in_place, args.delimiter, args.chunk_size, header, number == 0))
+    results = run_tasks(convert_csv_range, tasks, args.jobs)
+    if len(parts) > 1:
+        with open(args.output, 'wb') as out:
+            for part in parts:
+                with open(part, 'rb') as f:
+                    shutil.copyfileobj(f, out, 1 << 20)
+                os.remove(part)
+    return results
+
+
+def convert_parquet_part(task):
+    path, output, row_groups, columns, source, target, years, in_place, chunk_size = task
+    _require_pyarrow()
+    converter = DateConverter(source, target, *years)
+    parquet = pq.ParquetFile(path)
+    writer = None
+    rows_done = errors = 0
+
+    def convert_table(table):
+        nonlocal errors
+        for column in columns:
+            values, failed = converter.convert_arrow(table.column(column))
+            errors += failed
+            if in_place:
+                table = table.set_column(table.schema.get_field_index(column), column, values)
+            else:
+                table = table.append_column(output_name(column, target, False), values)
+        return table
+
+    try:
+        for batch in parquet.iter_batches(batch_size=chunk_size, row_groups=row_groups):
+            table = convert_table(pa.Table.from_batches([batch]))
+            if writer is None:
+                writer = pq.ParquetWriter(output, table.schema)
+            writer.write_table(table)
+            rows_done += table.num_rows
+        if writer is None:
+            # No rows: still write a file, with the schema the rows would have had.
+            table = convert_table(parquet.schema_arrow.empty_table())
+            writer = pq.ParquetWriter(output, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows_done, errors
+
+
+def convert_parquet(args, years):
+    _require_pyarrow()
+    parquet = pq.ParquetFile(args.input)
+    missing = [column for column in args.column if column not in parquet.schema_arrow.names]
+    if missing:
+        raise ValueError(f"Columns not found in {args.input}: {', '.join(missing)}")
+    groups = list(range(parquet.num_row_groups))
+    jobs = max(1, min(args.jobs, len(groups)))
+    shards = [groups[i * len(groups) // jobs:(i + 1) * len(groups) // jobs] for i in range(jobs)]
+    parts = [args.output] if jobs == 1 else [f'{args.output}.part{i}' for i in range(jobs)]
+    tasks = [(args.input, part, shard, args.column, args.source, args.target, years, args.in_place, args.chunk_size)
+             for part, shard in zip(parts, shards)]
+    results = run_tasks(convert_parquet_part, tasks, jobs)
+    if jobs > 1:
+        writer = None
+        try:
+            for part in parts:
+                if not os.path.exists(part):
+                    continue
+                parquet = pq.ParquetFile(part)
+                if writer is None:
+                    writer = pq.ParquetWriter(args.output, parquet.schema_arrow)
+                for batch in parquet.iter_batches(batch_size=args.chunk_size):
+                    writer.write_batch(batch)
+                os.remove(part)
+        finally:
+            if writer is not None:
+                writer.close()
+    return results
+
+
+def run_tasks(function, tasks, jobs):
+    if jobs <= 1 or len(tasks) == 1:
+        return [function(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(function, tasks))
+
+
+def file_format(path, override=None):
+    if override:
+        return override
+    return 'parquet' if path.lower().endswith(('.parquet', '.pq')) else 'csv'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert date columns between Gregorian, Jalali and Hijri.")
+    parser.add_argument('--convert', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--column', action='append', required=True, help="Date column to convert (repeatable)")
+    parser.add_argument('--from', dest='source', choices=SYSTEMS, default='gregorian')
+    parser.add_argument('--to', dest='target', choices=SYSTEMS, required=True)
+    parser.add_argument('--in-place', action='store_true', help="Replace the column instead of adding <column>_<to>")
+    parser.add_argument('--format', choices=['csv', 'parquet'], help="File format (default: from the extension)")
+    parser.add_argument('--delimiter', default=',')
+    parser.add_argument('--chunk-size', type=int, default=100000, help="Rows per chunk")
+    parser.add_argument('--jobs', type=int, default=1, help="Worker processes")
+    parser.add_argument('--years', help="Jalali/Hijri table span as FIRST:LAST (default 1300:1600)")
+    parser.add_argument('--report', help="Write the throughput report as JSON to this file")
+    args = parser.parse_args(argv)
+    if os.path.abspath(args.input) == os.path.abspath(args.output):
+        parser.error("input and output must be different files")
+    years = (None, None)
+    if args.years:
+        first, _, last = args.years.partition(':')
+        years = (int(first), int(last))
+    args.jobs = max(1, args.jobs)
+    started = time.perf_counter()
+    try:
+        if file_format(args.input, args.format) == 'parquet':
+            results = convert_parquet(args, years)
+        else:
+            results = convert_csv(args, years)
+    except (ValueError, ImportError, OSError) as e:
+        print(f"date_convert: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    rows = sum(count for count, _ in results)
+    report = {
+        'rows': rows,
+        'unconverted': sum(failed for _, failed in results),
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(rows / elapsed) if elapsed else None,
+        'jobs': args.jobs
+    }
+    print(f"Converted {report['rows']} rows in {report['seconds']} s "
+          f"({report['rows_per_second']} rows/s, {report['jobs']} jobs, "
+          f"{report['unconverted']} values left empty)", file=sys.stderr)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
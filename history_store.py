@@ -0,0 +1,147 @@
+import json
+import os
+import time
+
+
+class HistoryStore:
+    def __init__(self, path='calendar_clock_history.jsonl', legacy_path='calendar_clock_history.json',
+                 sync_interval=2.0, sync_every=64):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.sync_interval = sync_interval
+        self.sync_every = sync_every
+        self.file = None
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def migrate(self):
+        if os.path.exists(self.path) or not self.legacy_path or not os.path.exists(self.legacy_path):
+            return False
+        with open(self.legacy_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        self.rewrite(entries)
+        return True
+
+    def iter_entries(self):
+        self.migrate()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # A torn last line from an interrupted write.
+                        continue
+        except FileNotFoundError:
+            return
+
+    def load(self):
+        return list(self.iter_entries())
+
+    def read_page(self, end=None, count=500, block_size=65536):
+        # Returns up to `count` entries from the lines that end at byte offset
+        # `end` (end of file by default), plus the offset of the first line
+        # returned. Pass that offset back as `end` to read the page before it;
+        # an offset of 0 means there is nothing older.
+        self.migrate()
+        if self.file is not None:
+            self.file.flush()
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return [], 0
+        with f:
+            if end is None:
+                end = f.seek(0, os.SEEK_END)
+            start = end
+            chunks = []
+            newlines = 0
+            while start > 0 and newlines <= count:
+                size = min(block_size, start)
+                start -= size
+                f.seek(start)
+                chunk = f.read(size)
+                chunks.append(chunk)
+                newlines += chunk.count(b'\n')
+        data = b''.join(reversed(chunks))
+        if start > 0:
+            cut = data.index(b'\n') + 1
+            data = data[cut:]
+            start += cut
+        lines = data.split(b'\n')
+        if lines and lines[-1] == b'':
+            lines.pop()
+        skip = max(0, len(lines) - count)
+        start += sum(len(line) + 1 for line in lines[:skip])
+        entries = []
+        for line in lines[skip:]:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line.decode('utf-8')))
+            except ValueError:
+                continue
+        return entries, start
+
+    def open(self):
+        if self.file is None:
+            self.migrate()
+            self.file = open(self.path, 'a', encoding='utf-8')
+        return self.file
+
+    def append(self, entries):
+        f = self.open()
+        f.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries))
+        f.flush()
+        self.unsynced += len(entries)
+        if self.unsynced >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        if self.file is not None and self.unsynced:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        if self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
+
+    def clear(self):
+        self.rewrite([])
+
+    def rewrite(self, entries):
+        self.close()
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def compact(self, max_entries=None):
+        entries = self.load()
+        if max_entries is not None:
+            entries = entries[-max_entries:] if max_entries > 0 else []
+        self.rewrite(entries)
+        return len(entries)
+
+    def export_json(self, file_path):
+        # Streams the same layout json.dump(history, indent=4) produces
+        # without holding the whole history in memory.
+        with open(file_path, 'w', encoding='utf-8') as f:
+            first = True
+            for entry in self.iter_entries():
+                f.write('[\n' if first else ',\n')
+                first = False
+                body = json.dumps(entry, ensure_ascii=False, indent=4)
+                f.write('\n'.join('    ' + line for line in body.split('\n')))
+            f.write('[]' if first else '\n]')
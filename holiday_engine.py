@@ -0,0 +1,370 @@
+import json
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import date, MINYEAR, MAXYEAR
+
+import calendar_engine
+
+# Holidays are produced by providers, expanded one Gregorian year at a time
+# into a sorted array of date ordinals per calendar, and answered per month
+# with a single bisect slice.
+
+
+def easter_ordinal(year):
+    # Anonymous Gregorian computus (Meeus/Jones/Butcher).
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1).toordinal()
+
+
+def julian_to_ordinal(year, month, day):
+    a = (14 - month) // 12
+    y = year + 4800 - a
+    m = month + 12 * a - 3
+    return day + (153 * m + 2) // 5 + 365 * y + y // 4 - 32083 - 1721425
+
+
+def orthodox_easter_ordinal(year):
+    # Meeus Julian computus, converted from the Julian calendar.
+    a = year % 4
+    b = year % 7
+    c = year % 19
+    d = (19 * c + 15) % 30
+    e = (2 * a + 4 * b - d + 34) % 7
+    month, day = divmod(d + e + 114, 31)
+    return julian_to_ordinal(year, month, day + 1)
+
+
+CALENDAR_SYSTEMS = ('gregorian', 'jalali', 'hijri')
+
+MOVABLE_FEASTS = {
+    'easter': easter_ordinal,
+    'orthodox_easter': orthodox_easter_ordinal,
+}
+
+
+def hijri_year_of(ordinal):
+    return (30 * (ordinal - calendar_engine.ISLAMIC_EPOCH) + 10646) // 10631
+
+
+def month_bounds(system, year, month, tables=None):
+    """Return (first day ordinal, length) of a month in the given calendar."""
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid {system} month: {month}")
+    table = (tables or {}).get(system)
+    if table is not None and table.first_year <= year <= table.last_year:
+        return table.month_start(year, month), table.month_length(year, month)
+    if system == 'gregorian':
+        leap = calendar_engine.is_gregorian_leap(year)
+        days = calendar_engine.GREGORIAN_LEAP_MONTH_DAYS if leap else calendar_engine.GREGORIAN_MONTH_DAYS
+        return date(year, month, 1).toordinal(), days[month]
+    if system == 'jalali':
+        start = calendar_engine.jalali_new_year_ordinal(year) + (
+            (month - 1) * 31 if month <= 7 else 186 + (month - 7) * 30)
+        if month < 12:
+            return start, 31 if month <= 6 else 30
+        return start, calendar_engine.jalali_new_year_ordinal(year + 1) - start
+    if system == 'hijri':
+        start = calendar_engine.hijri_month_start_ordinal(year, month)
+        if month < 12:
+            end = calendar_engine.hijri_month_start_ordinal(year, month + 1)
+        else:
+            end = calendar_engine.hijri_month_start_ordinal(year + 1, 1)
+        return start, end - start
+    raise ValueError(f"Unknown calendar system: {system}")
+
+
+def gregorian_year_bounds(year):
+    start = date(year, 1, 1).toordinal()
+    return start, date(year, 12, 31).toordinal() + 1
+
+
+def overlapping_years(system, year):
+    """Years of ``system`` that share at least one day with Gregorian ``year``."""
+    if system == 'gregorian':
+        return [year]
+    # Jalali and Hijri years before year 1 are not supported.
+    if system == 'jalali':
+        return [y for y in (year - 622, year - 621) if y >= 1]
+    if system == 'hijri':
+        start, end = gregorian_year_bounds(year)
+        return list(range(max(1, hijri_year_of(start)), hijri_year_of(end - 1) + 1))
+    raise ValueError(f"Unknown calendar system: {system}")
+
+
+class HolidayRule:
+    """One holiday definition.
+
+    Fixed dates use ``month`` and ``day`` in the rule's calendar. Floating
+    dates use ``month``, ``weekday`` (Monday is 0) and ``nth`` (negative
+    counts from the end of the month). Movable feasts use ``feast``, one of
+    MOVABLE_FEASTS. ``offset`` shifts the result and ``length`` spans
+    several days.
+    """
+
+    def __init__(self, name, calendar='gregorian', month=None, day=None, weekday=None, nth=None,
+                 feast=None, offset=0, length=1):
+        if feast is not None:
+            if feast not in MOVABLE_FEASTS:
+                raise ValueError(f"Unknown movable feast: {feast}")
+        elif month is None or (day is None) == (weekday is None):
+            raise ValueError(f"Holiday {name!r} needs month and either day or weekday")
+        if weekday is not None and (not 0 <= weekday <= 6 or not nth):
+            raise ValueError(f"Holiday {name!r} needs a weekday in 0..6 and a non-zero nth")
+        if calendar not in CALENDAR_SYSTEMS:
+            raise ValueError(f"Unknown calendar system: {calendar}")
+        if length < 1:
+            raise ValueError(f"Holiday {name!r} must last at least one day")
+        self.name = name
+        self.calendar = calendar
+        self.month = month
+        self.day = day
+        self.weekday = weekday
+        self.nth = nth
+        self.feast = feast
+        self.offset = offset
+        self.length = length
+
+    @classmethod
+    def from_dict(cls, data):
+        fields = ('name', 'calendar', 'month', 'day', 'weekday', 'nth', 'feast', 'offset', 'length')
+        return cls(**{key: data[key] for key in fields if key in data})
+
+    def first_days(self, year, tables):
+        if self.feast is not None:
+            feast = MOVABLE_FEASTS[self.feast]
+            for feast_year in (year - 1, year, year + 1):
+                if MINYEAR <= feast_year <= MAXYEAR:
+                    yield feast(feast_year)
+            return
+        for rule_year in overlapping_years(self.calendar, year):
+            try:
+                start, length = month_bounds(self.calendar, rule_year, self.month, tables)
+            except ValueError:
+                continue
+            if self.day is not None:
+                if self.day <= length:
+                    yield start + self.day - 1
+            elif self.nth > 0:
+                ordinal = start + (self.weekday - (start + 6) % 7) % 7 + 7 * (self.nth - 1)
+                if ordinal < start + length:
+                    yield ordinal
+            else:
+                last = start + length - 1
+                ordinal = last - ((last + 6) % 7 - self.weekday) % 7 + 7 * (self.nth + 1)
+                if ordinal >= start:
+                    yield ordinal
+
+    def occurrences(self, year, tables=None):
+        """Yield the ordinals of this holiday that fall in Gregorian ``year``."""
+        year_start, year_end = gregorian_year_bounds(year)
+        for first in self.first_days(year, tables):
+            first += self.offset
+            for ordinal in range(max(first, year_start), min(first + self.length, year_end)):
+                yield ordinal
+
+
+class HolidayProvider:
+    """Source of holidays. ``expand`` yields (calendar, ordinal, name) for one Gregorian year."""
+
+    def expand(self, year, tables=None):
+        raise NotImplementedError
+
+
+class RuleHolidayProvider(HolidayProvider):
+    def __init__(self, rules):
+        self.rules = [rule if isinstance(rule, HolidayRule) else HolidayRule.from_dict(rule) for rule in rules]
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            calendar = data.get('calendar', 'gregorian')
+            data = [dict({'calendar': calendar}, **rule) for rule in data.get('holidays', [])]
+        return cls(data)
+
+    def expand(self, year, tables=None):
+        for rule in self.rules:
+            for ordinal in rule.occurrences(year, tables):
+                yield rule.calendar, ordinal, rule.name
+
+
+ICALENDAR_WEEKDAYS = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+
+
+def _unfold_icalendar(text):
+    lines = []
+    for line in text.splitlines():
+        if line[:1] in (' ', '\t') and lines:
+            lines[-1] += line[1:]
+        elif line:
+            lines.append(line)
+    return lines
+
+
+def _icalendar_text(value):
+    return (value.replace('\\n', '\n').replace('\\N', '\n').replace('\\,', ',')
+            .replace('\\;', ';').replace('\\\\', '\\'))
+
+
+def _icalendar_date(value):
+    value = value[:8]
+    return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+
+
+class ICalendarHolidayProvider(HolidayProvider):
+    """All-day VEVENTs from an iCalendar file.
+
+    Events with ``RRULE:FREQ=YEARLY`` become rules (``BYMONTH`` with an
+    ordinal ``BYDAY`` such as ``4TH`` or ``-1MO`` gives a floating date);
+    other events are single dates.
+    """
+
+    def __init__(self, path, calendar='gregorian'):
+        self.calendar = calendar
+        self.rules = []
+        self.dates = []
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = _unfold_icalendar(f.read())
+        event = None
+        for line in lines:
+            key, _, value = line.partition(':')
+            name = key.split(';', 1)[0].upper()
+            if name == 'BEGIN' and value.upper() == 'VEVENT':
+                event = {}
+            elif name == 'END' and value.upper() == 'VEVENT':
+                if event is not None:
+                    self.add_event(event)
+                event = None
+            elif event is not None:
+                event[name] = value
+        self.dates.sort()
+        self.date_keys = [ordinal for ordinal, _ in self.dates]
+
+    def add_event(self, event):
+        if 'DTSTART' not in event:
+            return
+        start = _icalendar_date(event['DTSTART'])
+        length = 1
+        if 'DTEND' in event:
+            length = max(1, _icalendar_date(event['DTEND']).toordinal() - start.toordinal())
+        summary = _icalendar_text(event.get('SUMMARY', ''))
+        rrule = dict(part.partition('=')[::2] for part in event.get('RRULE', '').split(';') if part)
+        if rrule.get('FREQ', '').upper() != 'YEARLY':
+            for offset in range(length):
+                self.dates.append((start.toordinal() + offset, summary))
+            return
+        month = int(rrule.get('BYMONTH', start.month))
+        byday = rrule.get('BYDAY', '')
+        if byday[-2:].upper() in ICALENDAR_WEEKDAYS and byday[:-2]:
+            rule = HolidayRule(summary, self.calendar, month=month, weekday=ICALENDAR_WEEKDAYS[byday[-2:].upper()],
+                               nth=int(byday[:-2]), length=length)
+        else:
+            rule = HolidayRule(summary, self.calendar, month=month, day=start.day, length=length)
+        self.rules.append(rule)
+
+    def expand(self, year, tables=None):
+        for rule in self.rules:
+            for ordinal in rule.occurrences(year, tables):
+                yield rule.calendar, ordinal, rule.name
+        year_start, year_end = gregorian_year_bounds(year)
+        for index in range(bisect_left(self.date_keys, year_start), bisect_left(self.date_keys, year_end)):
+            ordinal, name = self.dates[index]
+            yield self.calendar, ordinal, name
+
+
+def load_provider(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        return RuleHolidayProvider.from_json(path)
+    if extension in ('.ics', '.ical'):
+        return ICalendarHolidayProvider(path)
+    raise ValueError(f"Unsupported holiday file: {path}")
+
+
+class HolidayIndex:
+    def __init__(self, providers=(), tables=None):
+        self.providers = list(providers)
+        self.tables = tables or {}
+        self.clear()
+
+    def clear(self):
+        self.years = set()
+        self.ordinals = {}
+        self.names = {}
+
+    def add_provider(self, provider):
+        self.providers.append(provider)
+        self.clear()
+
+    def expand_year(self, year):
+        if year in self.years:
+            return
+        self.years.add(year)
+        expanded = {}
+        for provider in self.providers:
+            for calendar, ordinal, name in provider.expand(year, self.tables):
+                expanded.setdefault(calendar, []).append((ordinal, name))
+        for calendar, entries in expanded.items():
+            # Every entry lies inside ``year``, so the block slots in whole.
+            entries.sort()
+            ordinals = self.ordinals.setdefault(calendar, array('l'))
+            names = self.names.setdefault(calendar, [])
+            at = bisect_left(ordinals, entries[0][0])
+            ordinals[at:at] = array('l', [ordinal for ordinal, _ in entries])
+            names[at:at] = [name for _, name in entries]
+
+    def between(self, calendar, start, end):
+        """Return (ordinal, name) pairs of ``calendar`` in [start, end)."""
+        if end <= start:
+            return []
+        for year in range(date.fromordinal(start).year, date.fromordinal(end - 1).year + 1):
+            self.expand_year(year)
+        ordinals = self.ordinals.get(calendar)
+        if not ordinals:
+            return []
+        low = bisect_left(ordinals, start)
+        high = bisect_left(ordinals, end)
+        return list(zip(ordinals[low:high], self.names[calendar][low:high]))
+
+    def month(self, system, year, month):
+        """Return {day of month: [names]} for one month of ``system``'s holidays."""
+        start, length = month_bounds(system, year, month, self.tables)
+        days = {}
+        for ordinal, name in self.between(system, start, start + length):
+            days.setdefault(ordinal - start + 1, []).append(name)
+        return days
+
+
+DEFAULT_RULES = [
+    {'calendar': 'gregorian', 'month': 1, 'day': 1, 'name': 'New Year'},
+    {'calendar': 'gregorian', 'month': 12, 'day': 25, 'name': 'Christmas'},
+    {'calendar': 'gregorian', 'feast': 'easter', 'name': 'Easter'},
+    {'calendar': 'jalali', 'month': 1, 'day': 1, 'length': 2, 'name': 'نوروز'},
+    {'calendar': 'hijri', 'month': 1, 'day': 10, 'name': 'عاشورا'},
+    {'calendar': 'hijri', 'month': 9, 'day': 1, 'name': 'آغاز رمضان'},
+    {'calendar': 'hijri', 'month': 12, 'day': 17, 'name': 'عید قربان'}
+]
+
+
+def load_holiday_index(directory='calendar_clock_holidays', tables=None):
+    """Build an index from DEFAULT_RULES plus every rule file in ``directory``."""
+    providers = [RuleHolidayProvider(DEFAULT_RULES)]
+    if directory and os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            try:
+                providers.append(load_provider(os.path.join(directory, name)))
+            except (OSError, ValueError, TypeError, KeyError) as e:
+                print(f"Skipping holiday file {name}: {e}", file=sys.stderr)
+    return HolidayIndex(providers, tables)
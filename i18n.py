@@ -0,0 +1,124 @@
+import json
+import os
+import struct
+import sys
+
+# Translation catalogs. Sources are locales/<lang>.json; lists (weekday and
+# month names) are stored under indexed keys such as "months.0". The runtime
+# reads compiled GNU .mo files, one language at a time, and falls back to the
+# JSON source when the compiled file is missing or older than it. Catalogs are
+# only compiled by running this module (python i18n.py), never at runtime.
+
+LOCALE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'locales')
+LANGUAGES = ('en', 'fa', 'zh', 'ru')
+MO_MAGIC = 0x950412de
+MO_HEADER = struct.Struct('<7I')
+MO_METADATA = 'Content-Type: text/plain; charset=UTF-8\n'
+
+
+def flatten_messages(source):
+    messages = {}
+    for key, value in source.items():
+        if isinstance(value, list):
+            for index, item in enumerate(value):
+                messages[f'{key}.{index}'] = item
+        else:
+            messages[key] = value
+    return messages
+
+
+def write_mo(messages, path):
+    entries = sorted([('', MO_METADATA)] + list(messages.items()))
+    ids = [key.encode('utf-8') for key, _ in entries]
+    strs = [value.encode('utf-8') for _, value in entries]
+    ids_offset = MO_HEADER.size
+    strs_offset = ids_offset + 8 * len(entries)
+    data_offset = strs_offset + 8 * len(entries)
+    tables = []
+    blobs = []
+    for group in (ids, strs):
+        table = []
+        for blob in group:
+            table.append((len(blob), data_offset))
+            blobs.append(blob + b'\0')
+            data_offset += len(blob) + 1
+        tables.append(table)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(MO_HEADER.pack(MO_MAGIC, 0, len(entries), ids_offset, strs_offset, 0, 0))
+        for table in tables:
+            for length, offset in table:
+                f.write(struct.pack('<2I', length, offset))
+        f.write(b''.join(blobs))
+    os.replace(temp_path, path)
+
+
+def read_mo(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, revision, count, ids_offset, strs_offset, _, _ = MO_HEADER.unpack_from(data)
+    if magic != MO_MAGIC or revision != 0:
+        raise ValueError(f"Not a compiled catalog: {path}")
+    messages = {}
+    for index in range(count):
+        id_length, id_offset = struct.unpack_from('<2I', data, ids_offset + 8 * index)
+        str_length, str_offset = struct.unpack_from('<2I', data, strs_offset + 8 * index)
+        key = data[id_offset:id_offset + id_length].decode('utf-8')
+        if key:
+            messages[key] = data[str_offset:str_offset + str_length].decode('utf-8')
+    return messages
+
+
+def read_source(lang, locale_dir=LOCALE_DIR):
+    with open(os.path.join(locale_dir, f'{lang}.json'), 'r', encoding='utf-8') as f:
+        return flatten_messages(json.load(f))
+
+
+def compile_catalog(lang, locale_dir=LOCALE_DIR):
+    messages = read_source(lang, locale_dir)
+    write_mo(messages, os.path.join(locale_dir, f'{lang}.mo'))
+    return messages
+
+
+class Catalog:
+    def __init__(self, lang, messages):
+        self.lang = lang
+        self.messages = messages
+
+    def __getitem__(self, key):
+        return self.messages[key]
+
+    def get(self, key, default=None):
+        return self.messages.get(key, default)
+
+    def list(self, key):
+        items = []
+        while f'{key}.{len(items)}' in self.messages:
+            items.append(self.messages[f'{key}.{len(items)}'])
+        return items
+
+
+_catalogs = {}
+
+
+def load_catalog(lang, locale_dir=LOCALE_DIR):
+    key = (lang, locale_dir)
+    if key in _catalogs:
+        return _catalogs[key]
+    source = os.path.join(locale_dir, f'{lang}.json')
+    compiled = os.path.join(locale_dir, f'{lang}.mo')
+    try:
+        stale = os.path.exists(source) and os.path.getmtime(source) > os.path.getmtime(compiled)
+        messages = None if stale else read_mo(compiled)
+    except (OSError, ValueError, struct.error, UnicodeDecodeError):
+        messages = None
+    if messages is None:
+        messages = read_source(lang, locale_dir)
+    _catalogs[key] = Catalog(lang, messages)
+    return _catalogs[key]
+
+
+if __name__ == '__main__':
+    for lang in sys.argv[1:] or LANGUAGES:
+        compile_catalog(lang)
+        print(f"Compiled {lang}.mo")
@@ -0,0 +1,179 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Opt-in timing of named hot paths. Methods are registered with
+# Profiler.instrument(cls, names); enable() swaps timing wrappers onto the
+# classes and disable() puts the original functions back, so a disabled
+# profiler costs nothing on the instrumented paths.
+
+HISTOGRAM_BUCKETS = 32
+TRACE_LIMIT = 100000
+
+
+class Histogram:
+    """Call durations in power-of-two microsecond buckets."""
+
+    __slots__ = ('counts', 'count', 'total', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.counts = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, seconds):
+        micros = int(seconds * 1000000)
+        self.counts[min(micros.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.minimum is None or seconds < self.minimum:
+            self.minimum = seconds
+        if self.maximum is None or seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, fraction):
+        # Upper edge of the bucket holding the requested rank, capped at the
+        # largest value seen.
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.maximum, (1 << index) / 1000000)
+        return self.maximum
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.minimum,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'max': self.maximum,
+            'buckets_us': {str(1 << index): count for index, count in enumerate(self.counts) if count}
+        }
+
+
+def rss_bytes():
+    """Resident set size of this process, or None where it cannot be read."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current RSS; kilobytes on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+
+class Profiler:
+    def __init__(self, trace_limit=TRACE_LIMIT):
+        self.enabled = False
+        self.targets = []
+        self.originals = {}
+        self.histograms = {}
+        self.trace = deque(maxlen=trace_limit)
+        self.counters = deque(maxlen=trace_limit)
+        self.origin = time.perf_counter()
+
+    def instrument(self, cls, names, prefix=None):
+        prefix = prefix or cls.__name__
+        for name in names:
+            self.targets.append((cls, name, f'{prefix}.{name}'))
+        if self.enabled:
+            self.enable()
+
+    def wrap(self, function, label):
+        record = self.record
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(label, started, time.perf_counter() - started)
+        return timed
+
+    def enable(self):
+        for cls, name, label in self.targets:
+            if (cls, name) not in self.originals:
+                original = cls.__dict__[name]
+                self.originals[(cls, name)] = original
+                setattr(cls, name, self.wrap(original, label))
+        self.enabled = True
+
+    def disable(self):
+        for (cls, name), original in self.originals.items():
+            setattr(cls, name, original)
+        self.originals.clear()
+        self.enabled = False
+
+    def reset(self):
+        self.histograms.clear()
+        self.trace.clear()
+        self.counters.clear()
+
+    def record(self, label, started, elapsed):
+        histogram = self.histograms.get(label)
+        if histogram is None:
+            histogram = self.histograms[label] = Histogram()
+        histogram.add(elapsed)
+        self.trace.append((label, started, elapsed, threading.get_ident()))
+
+    def sample(self, **values):
+        # Counter values (widget counts, RSS) shown as tracks in the trace.
+        self.counters.append((time.perf_counter(), values))
+
+    def summary(self):
+        return {label: histogram.summary() for label, histogram in sorted(self.histograms.items())}
+
+    def trace_events(self):
+        pid = os.getpid()
+        events = []
+        for label, started, elapsed, thread in self.trace:
+            events.append({
+                'name': label,
+                'cat': label.split('.', 1)[0],
+                'ph': 'X',
+                'ts': round((started - self.origin) * 1000000, 1),
+                'dur': round(elapsed * 1000000, 1),
+                'pid': pid,
+                'tid': thread
+            })
+        for sampled, values in self.counters:
+            for name, value in values.items():
+                events.append({
+                    'name': name,
+                    'ph': 'C',
+                    'ts': round((sampled - self.origin) * 1000000, 1),
+                    'pid': pid,
+                    'args': {name: value}
+                })
+        return events
+
+    def dump(self, path, **extra):
+        """Write a Chrome trace (chrome://tracing, Perfetto) with the histograms alongside."""
+        data = {
+            'traceEvents': self.trace_events(),
+            'displayTimeUnit': 'ms',
+            'histograms': self.summary()
+        }
+        data.update(extra)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+
+profiler = Profiler()
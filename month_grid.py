@@ -0,0 +1,153 @@
+import calendar
+from datetime import date
+from functools import lru_cache
+
+import calendar_engine
+from holiday_engine import CALENDAR_SYSTEMS, hijri_year_of, month_bounds
+
+# Month grids shared by the desktop calendar views and the server's
+# /api/month. A grid is plain data: weeks of seven day numbers (0 pads the
+# days before the 1st and after the last day), the holidays falling in the
+# month and the day that is today, if any. Weekdays follow the calendar
+# module: 0 is Monday.
+
+# Weeks in the desktop views and /api/month start on Sunday, like the weekday
+# names in the locale catalogs.
+WEEK_START = calendar.SUNDAY
+
+
+class MonthGrid:
+    """One month of one calendar laid out in weeks."""
+
+    __slots__ = ('system', 'year', 'month', 'first_weekday', 'start', 'length', 'weeks', 'holidays', 'today')
+
+    def __init__(self, system, year, month, first_weekday, start, length, weeks, holidays=None, today=None):
+        self.system = system
+        self.year = year
+        self.month = month
+        self.first_weekday = first_weekday
+        self.start = start
+        self.length = length
+        self.weeks = weeks
+        self.holidays = holidays or {}
+        self.today = today
+
+    def __repr__(self):
+        return f"MonthGrid({self.system!r}, {self.year}, {self.month})"
+
+    def is_holiday(self, day):
+        return day in self.holidays
+
+    def is_today(self, day):
+        return day != 0 and day == self.today
+
+    def ordinal(self, day):
+        return self.start + day - 1
+
+    def cells(self):
+        """Yield (week, column, day, holiday names, is today) for every cell."""
+        for week, days in enumerate(self.weeks):
+            for column, day in enumerate(days):
+                yield week, column, day, self.holidays.get(day, ()), self.is_today(day)
+
+
+def layout_weeks(start, length, first_weekday=0):
+    """Split a month starting on date ordinal ``start`` into weeks of seven day numbers."""
+    lead = ((start + 6) % 7 - first_weekday) % 7
+    days = [0] * lead + list(range(1, length + 1))
+    days += [0] * (-len(days) % 7)
+    return tuple(tuple(days[i:i + 7]) for i in range(0, len(days), 7))
+
+
+def locate(system, ordinal, tables=None):
+    """Return (year, month, day) of date ordinal ``ordinal`` in ``system``."""
+    if system == 'gregorian':
+        d = date.fromordinal(ordinal)
+        return d.year, d.month, d.day
+    table = (tables or {}).get(system)
+    if table is not None and table.covers(ordinal):
+        return tuple(table.locate(ordinal))
+    if system == 'jalali':
+        if ordinal < calendar_engine.jalali_new_year_ordinal(1):
+            raise ValueError("Date is before Jalali year 1")
+        d = date.fromordinal(ordinal)
+        return tuple(calendar_engine.gregorian_to_jalali(d.year, d.month, d.day))
+    if system == 'hijri':
+        year = hijri_year_of(ordinal)
+        if year < 1:
+            raise ValueError("Date is before Hijri year 1")
+        month = 12
+        while calendar_engine.hijri_month_start_ordinal(year, month) > ordinal:
+            month -= 1
+        return year, month, ordinal - calendar_engine.hijri_month_start_ordinal(year, month) + 1
+    raise ValueError(f"Unknown calendar system: {system}")
+
+
+def gregorian_grid(year, month, first_weekday=0, tables=None):
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid gregorian month: {month}")
+    start = date(year, month, 1).toordinal()
+    length = calendar.monthrange(year, month)[1]
+    return MonthGrid('gregorian', year, month, first_weekday, start, length,
+                     layout_weeks(start, length, first_weekday))
+
+
+def jalali_grid(year, month, first_weekday=0, tables=None):
+    start, length = month_bounds('jalali', year, month, tables)
+    return MonthGrid('jalali', year, month, first_weekday, start, length,
+                     layout_weeks(start, length, first_weekday))
+
+
+def hijri_grid(year, month, first_weekday=0, tables=None):
+    start, length = month_bounds('hijri', year, month, tables)
+    return MonthGrid('hijri', year, month, first_weekday, start, length,
+                     layout_weeks(start, length, first_weekday))
+
+
+GRID_BUILDERS = {
+    'gregorian': gregorian_grid,
+    'jalali': jalali_grid,
+    'hijri': hijri_grid,
+}
+
+
+class MonthGrids:
+    """Builds MonthGrids with holidays and today filled in, memoized per month.
+
+    Grids are cached on (system, year, month, first_weekday); the cache is
+    dropped when the date changes so the today marker moves at midnight.
+    """
+
+    def __init__(self, holidays=None, tables=None, maxsize=256):
+        self.holidays = holidays
+        self.tables = tables or {}
+        self.today = None
+        self.cached_grid = lru_cache(maxsize=maxsize)(self._build_grid)
+
+    def grid(self, system, year, month, first_weekday=0):
+        today = date.today().toordinal()
+        if today != self.today:
+            self.today = today
+            self.cached_grid.cache_clear()
+        return self.cached_grid(system, year, month, first_weekday)
+
+    def containing(self, system, ordinal, first_weekday=0):
+        """The grid of the ``system`` month that contains date ordinal ``ordinal``."""
+        year, month, _ = locate(system, ordinal, self.tables)
+        return self.grid(system, year, month, first_weekday)
+
+    def _build_grid(self, system, year, month, first_weekday):
+        if system not in CALENDAR_SYSTEMS:
+            raise ValueError(f"Unknown calendar system: {system}")
+        grid = GRID_BUILDERS[system](year, month, first_weekday, self.tables)
+        if self.holidays is not None:
+            try:
+                grid.holidays = {day: tuple(names) for day, names in self.holidays.month(system, year, month).items()}
+            except ValueError:
+                grid.holidays = {}
+        if grid.start <= self.today < grid.start + grid.length:
+            grid.today = self.today - grid.start + 1
+        return grid
+
+    def invalidate(self):
+        self.cached_grid.cache_clear()
@@ -0,0 +1,79 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import calendar_engine
+
+np = pytest.importorskip('numpy')
+
+# Every day from 1900 to 2100, plus every 97th day from 623 to 9999.
+ORDINALS = sorted(set(range(date(1900, 1, 1).toordinal(), date(2100, 12, 31).toordinal() + 1))
+                  | set(range(date(623, 1, 1).toordinal(), date(9999, 12, 31).toordinal(), 97)))
+
+
+def gregorian_dates():
+    return [date.fromordinal(o) for o in ORDINALS]
+
+
+def columns(triples):
+    return tuple(np.array(column, dtype=np.int64) for column in zip(*triples))
+
+
+def test_ordinal_batch_matches_date():
+    dates = gregorian_dates()
+    year, month, day = calendar_engine.ordinal_to_gregorian_batch(ORDINALS)
+    assert list(zip(year.tolist(), month.tolist(), day.tolist())) == [(d.year, d.month, d.day) for d in dates]
+    ordinals = calendar_engine.gregorian_to_ordinal_batch(*columns((d.year, d.month, d.day) for d in dates))
+    assert ordinals.tolist() == ORDINALS
+
+
+@pytest.mark.parametrize('to_batch, to_scalar, from_batch, from_scalar', [
+    (calendar_engine.gregorian_to_jalali_batch, calendar_engine.gregorian_to_jalali,
+     calendar_engine.jalali_to_gregorian_batch, calendar_engine.jalali_to_gregorian),
+    (calendar_engine.gregorian_to_hijri_batch, calendar_engine.gregorian_to_hijri,
+     calendar_engine.hijri_to_gregorian_batch, calendar_engine.hijri_to_gregorian),
+], ids=['jalali', 'hijri'])
+def test_batch_matches_scalar(to_batch, to_scalar, from_batch, from_scalar):
+    gregorian = [(d.year, d.month, d.day) for d in gregorian_dates()]
+    expected = [tuple(to_scalar(*g)) for g in gregorian]
+    converted = to_batch(*columns(gregorian))
+    assert list(zip(*(part.tolist() for part in converted))) == expected
+    back = from_batch(*converted)
+    assert list(zip(*(part.tolist() for part in back))) == [tuple(from_scalar(*c)) for c in expected]
+
+
+def test_jalali_table_matches_scalar():
+    table = calendar_engine.MonthStartTable('jalali', 1300, 1500)
+    ordinals = [o for o in ORDINALS if table.covers(o)]
+    assert [tuple(table.locate(o)) for o in ordinals] == [
+        tuple(calendar_engine.gregorian_to_jalali(*calendar_engine._ordinal_to_ymd(o))) for o in ordinals]
+
+
+@pytest.mark.parametrize('system', ['jalali', 'hijri'])
+def test_month_table_round_trip(system):
+    table = calendar_engine.MonthStartTable(system, 1300, 1500)
+    ordinals = [o for o in ORDINALS if table.covers(o)]
+    located = [tuple(table.locate(o)) for o in ordinals]
+    assert [table.to_ordinal(*ymd) for ymd in located] == ordinals
+    year, month, day = table.locate_batch(ordinals)
+    assert list(zip(year.tolist(), month.tolist(), day.tolist())) == located
+    assert table.valid_batch(year, month, day).all()
+    assert table.to_ordinal_batch(year, month, day).tolist() == ordinals
+
+
+@pytest.mark.parametrize('system', ['jalali', 'hijri'])
+def test_month_table_save_and_load(system, tmp_path):
+    path = str(tmp_path / f'{system}.bin')
+    built = calendar_engine.MonthStartTable(system, 1300, 1600, path)
+    starts = list(built.starts)
+    assert os.path.exists(path) and not os.path.exists(path + '.tmp')
+    loaded = calendar_engine.MonthStartTable(system, 1300, 1600, path)
+    assert list(loaded._load()) == starts
+    # A different span is rebuilt instead of read from the mismatched file.
+    other = calendar_engine.MonthStartTable(system, 1350, 1400, path)
+    assert other._load() is None
+    assert list(other.starts) == starts[50 * 12:101 * 12 + 1]
@@ -0,0 +1,99 @@
+import csv
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import date_convert
+
+pytest.importorskip('numpy')
+
+NOTES = ['plain', 'two\nlines', 'say ""hi""', '""quoted""\nand\nsplit', '']
+BAD_DATES = ['2024-02-30', 'not a date', '']
+
+
+def write_rows(path, count, long_note_at=None):
+    # Every 7th row has an unconvertible date; notes cycle through embedded
+    # newlines and doubled quotes.
+    rows = []
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('id,note,date\n')
+        for i in range(count):
+            note = NOTES[i % len(NOTES)]
+            if i == long_note_at:
+                note = 'x\n' * 2000
+            day = BAD_DATES[i // 7 % len(BAD_DATES)] if i % 7 == 3 else f'{1990 + i % 40}-{1 + i % 12:02d}-{1 + i % 28:02d}'
+            f.write(f'{i},"{note}",{day}\n')
+            rows.append([str(i), note.replace('""', '"'), day])
+    return rows
+
+
+def convert(tmp_path, source, name, *options):
+    output = str(tmp_path / name)
+    report = str(tmp_path / f'{name}.json')
+    assert date_convert.main([source, output, '--column', 'date', '--to', 'jalali', '--report', report,
+                              *options]) == 0
+    with open(report, encoding='utf-8') as f:
+        return output, json.load(f)
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return list(csv.reader(f))
+
+
+def test_records_keep_quoted_newlines(tmp_path):
+    path = str(tmp_path / 'in.csv')
+    rows = write_rows(path, 10)
+    records = list(date_convert.iter_csv_records(path, 0, os.path.getsize(path)))
+    assert len(records) == 11
+    assert [next(csv.reader([record.decode('utf-8')])) for record in records[1:]] == rows
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 1000])
+def test_chunks_split_on_records(tmp_path, chunk_size):
+    source = str(tmp_path / 'in.csv')
+    rows = write_rows(source, 50)
+    output, report = convert(tmp_path, source, 'out.csv', '--chunk-size', str(chunk_size))
+    converted = read_csv(output)
+    assert converted[0] == ['id', 'note', 'date', 'date_jalali']
+    assert [row[:3] for row in converted[1:]] == rows
+    assert report['rows'] == 50
+    unconverted = sum(1 for row in rows if not row[2][:1].isdigit() or row[2] == '2024-02-30')
+    assert report['unconverted'] == unconverted == sum(1 for row in converted[1:] if not row[3])
+
+
+def test_job_ranges_start_on_records(tmp_path):
+    source = str(tmp_path / 'in.csv')
+    write_rows(source, 200, long_note_at=100)
+    start = date_convert.csv_header(source, ',')[1]
+    size = os.path.getsize(source)
+    # The even split point lands inside the long quoted note.
+    with open(source, 'rb') as f:
+        data = f.read()
+    middle = start + (size - start + 1) // 2
+    assert data.rindex(b'"x\n', 0, middle) < middle < data.index(b'x\n"', middle)
+    ranges = date_convert.csv_ranges(source, start, 2)
+    assert ranges[0][0] == start and ranges[-1][1] == size
+    records = []
+    for range_start, range_end in ranges:
+        assert data[range_start - 1:range_start] == b'\n'
+        records.extend(date_convert.iter_csv_records(source, range_start, range_end))
+    assert len(records) == 200
+    assert b''.join(records) == data[start:]
+
+
+@pytest.mark.parametrize('jobs', [2, 3])
+def test_jobs_match_single_process(tmp_path, jobs):
+    source = str(tmp_path / 'in.csv')
+    write_rows(source, 300, long_note_at=150)
+    single, single_report = convert(tmp_path, source, 'single.csv', '--chunk-size', '7')
+    parallel, parallel_report = convert(tmp_path, source, 'parallel.csv', '--chunk-size', '7', '--jobs', str(jobs))
+    with open(single, 'rb') as a, open(parallel, 'rb') as b:
+        assert a.read() == b.read()
+    assert parallel_report['rows'] == single_report['rows'] == 300
+    assert parallel_report['unconverted'] == single_report['unconverted']
+    assert not [name for name in os.listdir(tmp_path) if '.part' in name]
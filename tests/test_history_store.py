@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HistoryStore
+
+
+def entries(count):
+    return [{'time': f'{i % 24:02d}:00:00', 'timezone': 'Asia/Tehran' if i % 3 else 'UTC',
+             'date': f'2024-01-01 {i % 24:02d}:00:00', 'action': 'Updated', 'note': 'é' * (i % 5)}
+            for i in range(count)]
+
+
+def make_store(tmp_path, legacy=None):
+    legacy_path = str(tmp_path / 'history.json')
+    if legacy is not None:
+        with open(legacy_path, 'w', encoding='utf-8') as f:
+            json.dump(legacy, f, indent=4)
+    return HistoryStore(str(tmp_path / 'history.jsonl'), legacy_path)
+
+
+def read_all_pages(store, count, block_size):
+    pages = []
+    entries, start = store.read_page(count=count, block_size=block_size)
+    pages.append(entries)
+    while start > 0:
+        entries, start = store.read_page(start, count, block_size)
+        pages.append(entries)
+    return pages
+
+
+def test_pages_of_migrated_legacy_file(tmp_path):
+    legacy = entries(137)
+    store = make_store(tmp_path, legacy)
+    # Blocks smaller than a line force partial first blocks and lines split
+    # across reads.
+    for count, block_size in ((10, 16), (7, 100), (137, 64), (500, 65536)):
+        pages = read_all_pages(store, count, block_size)
+        assert all(len(page) == count for page in pages[:-1])
+        assert [entry for page in reversed(pages) for entry in page] == legacy
+    assert os.path.exists(store.path)
+
+
+def test_pages_skip_torn_last_line(tmp_path):
+    store = make_store(tmp_path)
+    store.append(entries(20))
+    store.close()
+    with open(store.path, 'a', encoding='utf-8') as f:
+        f.write('{"time": "12:0')
+    pages = read_all_pages(store, 6, 32)
+    assert [entry for page in reversed(pages) for entry in page] == entries(20)
+    assert store.load() == entries(20)
+
+
+def test_appends_are_visible_to_read_page(tmp_path):
+    store = make_store(tmp_path)
+    store.append(entries(3))
+    store.append(entries(5)[3:])
+    assert store.read_page(count=10)[0] == entries(5)
+    store.close()
+
+
+def test_export_matches_json_dump(tmp_path):
+    for count in (0, 1, 12):
+        os.makedirs(tmp_path / str(count))
+        store = make_store(tmp_path / str(count))
+        store.append(entries(count))
+        store.close()
+        exported = str(tmp_path / f'export{count}.json')
+        store.export_json(exported)
+        with open(exported, encoding='utf-8') as f:
+            text = f.read()
+        expected = str(tmp_path / f'expected{count}.json')
+        with open(expected, 'w', encoding='utf-8') as f:
+            json.dump(entries(count), f, ensure_ascii=False, indent=4)
+        with open(expected, encoding='utf-8') as f:
+            assert text == f.read()
+
+
+def test_clear_then_reload(tmp_path):
+    store = make_store(tmp_path, entries(40))
+    assert len(store.load()) == 40
+    store.clear()
+    assert store.load() == []
+    assert store.read_page() == ([], 0)
+    reopened = make_store(tmp_path)
+    assert reopened.load() == []
+    reopened.append(entries(2))
+    reopened.close()
+    assert make_store(tmp_path).load() == entries(2)
@@ -0,0 +1,151 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from holiday_engine import (HolidayIndex, HolidayRule, ICalendarHolidayProvider, RuleHolidayProvider,
+                            easter_ordinal, orthodox_easter_ordinal)
+
+
+def dates(rule, year):
+    return [date.fromordinal(ordinal) for ordinal in rule.occurrences(year)]
+
+
+@pytest.mark.parametrize('year, western, orthodox', [
+    (1961, date(1961, 4, 2), date(1961, 4, 9)),
+    (2000, date(2000, 4, 23), date(2000, 4, 30)),
+    (2019, date(2019, 4, 21), date(2019, 4, 28)),
+    (2024, date(2024, 3, 31), date(2024, 5, 5)),
+    (2025, date(2025, 4, 20), date(2025, 4, 20)),
+    (2038, date(2038, 4, 25), date(2038, 4, 25)),
+])
+def test_easter(year, western, orthodox):
+    assert date.fromordinal(easter_ordinal(year)) == western
+    assert date.fromordinal(orthodox_easter_ordinal(year)) == orthodox
+
+
+def test_easter_offsets_cross_years():
+    # Ash Wednesday and Pentecost from the feast rule.
+    assert dates(HolidayRule('Ash Wednesday', feast='easter', offset=-46), 2024) == [date(2024, 2, 14)]
+    assert dates(HolidayRule('Pentecost', feast='orthodox_easter', offset=49, length=2), 2024) == [
+        date(2024, 6, 23), date(2024, 6, 24)]
+
+
+@pytest.mark.parametrize('month, weekday, nth, year, expected', [
+    (11, 3, 4, 2023, [date(2023, 11, 23)]),
+    (11, 3, 4, 2024, [date(2024, 11, 28)]),
+    (11, 3, 4, 2025, [date(2025, 11, 27)]),
+    (5, 0, -1, 2020, [date(2020, 5, 25)]),
+    (5, 0, -1, 2021, [date(2021, 5, 31)]),
+    (5, 0, -1, 2024, [date(2024, 5, 27)]),
+    (9, 0, 1, 2025, [date(2025, 9, 1)]),
+    (9, 0, 1, 2024, [date(2024, 9, 2)]),
+    (2, 3, 5, 2024, [date(2024, 2, 29)]),
+    (2, 3, 5, 2025, []),
+    (2, 4, -5, 2025, []),
+])
+def test_nth_weekday(month, weekday, nth, year, expected):
+    assert dates(HolidayRule('rule', month=month, weekday=weekday, nth=nth), year) == expected
+
+
+def test_hijri_rule_twice_in_one_year():
+    # Hijri years (tabular) are about 11 days shorter, so Ashura of 1430 and
+    # 1431 both fall in 2009.
+    ashura = HolidayRule('Ashura', 'hijri', month=1, day=10)
+    assert dates(ashura, 2009) == [date(2009, 1, 7), date(2009, 12, 27)]
+    assert dates(ashura, 2010) == [date(2010, 12, 17)]
+
+
+def test_jalali_rule_spanning_years():
+    nowruz = HolidayRule('Nowruz', 'jalali', month=1, day=1, length=2)
+    assert dates(nowruz, 2024) == [date(2024, 3, 20), date(2024, 3, 21)]
+    assert dates(nowruz, 2025) == [date(2025, 3, 21), date(2025, 3, 22)]
+    yalda = HolidayRule('Yalda', 'jalali', month=9, day=30, length=3)
+    assert dates(yalda, 2024) == [date(2024, 12, 20), date(2024, 12, 21), date(2024, 12, 22)]
+
+
+ICS = """BEGIN:VCALENDAR\r
+VERSION:2.0\r
+BEGIN:VEVENT\r
+DTSTART;VALUE=DATE:20201126\r
+RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=4TH\r
+SUMMARY:Thanksgiving\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+DTSTART;VALUE=DATE:20200525\r
+RRULE:FREQ=YEARLY;BYDAY=-1MO;BYMONTH=5\r
+SUMMARY:Memorial Day\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+DTSTART;VALUE=DATE:17760704\r
+DTEND;VALUE=DATE:17760705\r
+RRULE:FREQ=YEARLY\r
+SUMMARY:Independence\r
+  Day\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+DTSTART;VALUE=DATE:20241230\r
+DTEND;VALUE=DATE:20250102\r
+SUMMARY:Office closed\\, year end\r
+END:VEVENT\r
+END:VCALENDAR\r
+"""
+
+
+def test_icalendar_provider(tmp_path):
+    path = tmp_path / 'us.ics'
+    path.write_text(ICS, encoding='utf-8', newline='')
+    provider = ICalendarHolidayProvider(str(path))
+    expanded = sorted((date.fromordinal(ordinal), name) for _, ordinal, name in provider.expand(2025))
+    assert expanded == [
+        (date(2025, 1, 1), 'Office closed, year end'),
+        (date(2025, 5, 26), 'Memorial Day'),
+        (date(2025, 7, 4), 'Independence Day'),
+        (date(2025, 11, 27), 'Thanksgiving'),
+    ]
+    assert [(date.fromordinal(ordinal), name) for _, ordinal, name in provider.expand(2024)
+            if name.startswith('Office')] == [(date(2024, 12, 30), 'Office closed, year end'),
+                                              (date(2024, 12, 31), 'Office closed, year end')]
+
+
+def test_index_years_expanded_out_of_order():
+    rules = [
+        {'month': 1, 'day': 1, 'name': 'New Year'},
+        {'month': 12, 'day': 31, 'name': 'Eve'},
+        {'feast': 'easter', 'name': 'Easter'},
+        {'calendar': 'hijri', 'month': 1, 'day': 10, 'name': 'Ashura'},
+    ]
+    index = HolidayIndex([RuleHolidayProvider(rules)])
+    for year in (2025, 2009, 2024, 2010):
+        index.expand_year(year)
+    start, end = date(2009, 1, 1).toordinal(), date(2026, 1, 1).toordinal()
+    expected = HolidayIndex([RuleHolidayProvider(rules)])
+    for year in range(2009, 2026):
+        expected.expand_year(year)
+    gregorian = index.between('gregorian', start, end)
+    assert gregorian == sorted(gregorian)
+    assert [date.fromordinal(ordinal) for ordinal, _ in gregorian] == [
+        date(2009, 1, 1), date(2009, 4, 12), date(2009, 12, 31),
+        date(2010, 1, 1), date(2010, 4, 4), date(2010, 12, 31),
+        date(2011, 1, 1), date(2011, 4, 24), date(2011, 12, 31),
+        date(2012, 1, 1), date(2012, 4, 8), date(2012, 12, 31),
+        date(2013, 1, 1), date(2013, 3, 31), date(2013, 12, 31),
+        date(2014, 1, 1), date(2014, 4, 20), date(2014, 12, 31),
+        date(2015, 1, 1), date(2015, 4, 5), date(2015, 12, 31),
+        date(2016, 1, 1), date(2016, 3, 27), date(2016, 12, 31),
+        date(2017, 1, 1), date(2017, 4, 16), date(2017, 12, 31),
+        date(2018, 1, 1), date(2018, 4, 1), date(2018, 12, 31),
+        date(2019, 1, 1), date(2019, 4, 21), date(2019, 12, 31),
+        date(2020, 1, 1), date(2020, 4, 12), date(2020, 12, 31),
+        date(2021, 1, 1), date(2021, 4, 4), date(2021, 12, 31),
+        date(2022, 1, 1), date(2022, 4, 17), date(2022, 12, 31),
+        date(2023, 1, 1), date(2023, 4, 9), date(2023, 12, 31),
+        date(2024, 1, 1), date(2024, 3, 31), date(2024, 12, 31),
+        date(2025, 1, 1), date(2025, 4, 20), date(2025, 12, 31),
+    ]
+    assert gregorian == expected.between('gregorian', start, end)
+    assert index.between('hijri', start, end) == expected.between('hijri', start, end)
+    assert index.month('hijri', 1431, 1) == {10: ['Ashura']}
@@ -0,0 +1,62 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytz = pytest.importorskip('pytz')
+
+from time_service import ClockBoard, ZoneOffsetCache
+
+ZONES = ['Europe/London', 'America/New_York', 'Australia/Lord_Howe', 'Asia/Kathmandu', 'Asia/Tehran', 'UTC']
+START = datetime(2024, 1, 1, tzinfo=pytz.utc)
+
+
+def expected(instant, name):
+    local = instant.astimezone(pytz.timezone(name))
+    return local.replace(tzinfo=None), local.utcoffset(), local.tzname()
+
+
+def check(board, instant):
+    snapshot = board.snapshot(instant)
+    for name, local_time, offset, abbreviation, text in zip(
+            snapshot.zones, snapshot.local_times, snapshot.offsets, snapshot.abbreviations, snapshot.formatted):
+        wall, expected_offset, expected_abbreviation = expected(instant, name)
+        assert (local_time.replace(tzinfo=None), offset, abbreviation) == (
+            wall, expected_offset, expected_abbreviation), (name, instant)
+        assert local_time.utcoffset() == expected_offset
+        assert text == wall.strftime(board.format_str)
+
+
+@pytest.mark.parametrize('step', [timedelta(minutes=30), timedelta(minutes=-30)], ids=['forward', 'backward'])
+def test_snapshot_matches_astimezone(step):
+    # 400 days every 30 minutes, walked forwards and backwards, so each cache
+    # crosses the spring and autumn transitions in both directions.
+    board = ClockBoard(ZONES)
+    count = 400 * 48
+    instant = START if step > timedelta(0) else START + step * -count
+    offsets = {name: set() for name in ZONES}
+    for _ in range(count):
+        check(board, instant)
+        for name in ZONES:
+            offsets[name].add(expected(instant, name)[1])
+        instant += step
+    assert len(offsets['Europe/London']) == len(offsets['America/New_York']) == 2
+    assert offsets['Australia/Lord_Howe'] == {timedelta(hours=10, minutes=30), timedelta(hours=11)}
+    assert len(offsets['Asia/Kathmandu']) == len(offsets['UTC']) == 1
+
+
+@pytest.mark.parametrize('name', ZONES[:3])
+def test_transition_edges(name):
+    tz = pytz.timezone(name)
+    transitions = [t for t in tz._utc_transition_times if START.replace(tzinfo=None) <= t < datetime(2025, 2, 1)]
+    assert len(transitions) == 2
+    cache = ZoneOffsetCache(tz)
+    for transition in transitions:
+        for delta in (timedelta(seconds=-1), timedelta(0), timedelta(seconds=1), timedelta(seconds=-1)):
+            utc_naive = transition + delta
+            local = cache.localize(utc_naive)
+            wall, offset, abbreviation = expected(pytz.utc.localize(utc_naive), name)
+            assert (local.replace(tzinfo=None), local.utcoffset(), cache.abbreviation) == (wall, offset, abbreviation)
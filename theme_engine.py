@@ -0,0 +1,158 @@
+# One application-wide stylesheet per theme, generated from the theme's
+# palette dict. Widgets opt into variants through dynamic properties
+# (buttonRole, clockRole, cellRole, dayState) instead of carrying their own
+# stylesheets, so switching themes is a single setStyleSheet call.
+
+STYLESHEET_TEMPLATE = """
+    QMainWindow, QMenuBar {{
+        background: {background};
+        color: {text};
+    }}
+    QWidget#central QTabWidget::pane {{
+        border: 1px solid {border_soft};
+        border-radius: 8px;
+        background: {surface};
+    }}
+    QWidget#central QTabBar::tab {{
+        padding: 10px 20px;
+        margin-right: 5px;
+        border-top-left-radius: 8px;
+        border-top-right-radius: 8px;
+        background: {tab};
+        color: {text};
+    }}
+    QWidget#central QTabBar::tab:selected {{
+        background: {accent_soft};
+        font-weight: bold;
+        color: {text};
+    }}
+    QWidget#central QComboBox, QWidget#central QLineEdit {{
+        border-radius: 8px;
+        padding: 8px;
+        font-size: 14px;
+        border: 1px solid {border};
+        background: {surface};
+        color: {text};
+    }}
+    QWidget#central QComboBox::drop-down {{
+        border: none;
+    }}
+    QWidget#central QComboBox QLineEdit {{
+        border: none;
+        padding: 0px;
+        background: transparent;
+    }}
+    QWidget#central QLineEdit[clockRole="digital"] {{
+        font-weight: bold;
+        color: {digital_text};
+    }}
+    QWidget#central QPushButton {{
+        border-radius: 8px;
+        font-size: 14px;
+        border: 1px solid {border_soft};
+        background: {accent_button};
+        color: white;
+    }}
+    QWidget#central QPushButton:hover {{
+        background: {accent};
+    }}
+    QWidget#central QPushButton[buttonRole="danger"] {{
+        background: {danger_button};
+    }}
+    QWidget#central QPushButton[buttonRole="danger"]:hover {{
+        background: {danger};
+    }}
+    QWidget#central QListWidget, QWidget#central QTextEdit {{
+        border-radius: 8px;
+        font-size: 14px;
+        border: 1px solid {border};
+        background: {surface};
+        color: {text};
+    }}
+    QWidget#central QTableView {{
+        border: 1px solid {border_soft};
+        border-radius: 8px;
+        background: {surface};
+        font-size: 12px;
+        color: {text};
+    }}
+    QWidget#central QTableView::item {{
+        padding: 5px;
+        border-bottom: 1px solid {border_soft};
+    }}
+    QWidget#central QHeaderView::section {{
+        font-weight: bold;
+        font-size: 14px;
+        padding: 5px;
+        border: none;
+        background: transparent;
+        color: {text};
+    }}
+    QLabel[cellRole="title"] {{
+        font-weight: bold;
+        font-size: 16px;
+        padding: 5px;
+        color: {text};
+    }}
+    QLabel[cellRole="header"] {{
+        font-weight: bold;
+        font-size: 14px;
+        padding: 5px;
+        color: {text};
+    }}
+    QLabel[dayState="normal"] {{
+        border-radius: 8px;
+        font-size: 14px;
+        background: {surface};
+        color: {text};
+    }}
+    QLabel[dayState="holiday"] {{
+        border-radius: 8px;
+        font-size: 14px;
+        background: {holiday};
+        color: {text};
+    }}
+    QLabel[today="true"] {{
+        border: 2px solid {accent};
+        font-weight: bold;
+    }}
+"""
+
+
+def rgba(color, alpha):
+    return f"rgba({color.red()}, {color.green()}, {color.blue()}, {alpha})"
+
+
+def compile_stylesheet(theme):
+    return STYLESHEET_TEMPLATE.format(
+        background=theme['background'].name(),
+        text=theme['text'].name(),
+        border=rgba(theme['text'], 0.2),
+        border_soft=rgba(theme['text'], 0.1),
+        tab=rgba(theme['text'], 0.05),
+        surface=rgba(theme['surface'], 0.95),
+        accent=rgba(theme['accent'], 1.0),
+        accent_button=rgba(theme['accent'], 0.8),
+        accent_soft=rgba(theme['accent'], 0.3),
+        danger=rgba(theme['danger'], 1.0),
+        danger_button=rgba(theme['danger'], 0.8),
+        digital_text=theme['digital_text'].name(),
+        holiday=theme['calendar_holiday'].name()
+    )
+
+
+class ThemeCompiler:
+    def __init__(self, themes):
+        self.themes = themes
+        self.cache = {}
+
+    def stylesheet(self, theme_name):
+        if theme_name not in self.cache:
+            self.cache[theme_name] = compile_stylesheet(self.themes[theme_name])
+        return self.cache[theme_name]
+
+    def invalidate(self, theme_name=None):
+        if theme_name is None:
+            self.cache.clear()
+        else:
+            self.cache.pop(theme_name, None)
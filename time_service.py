@@ -0,0 +1,197 @@
+import time
+from bisect import bisect_right
+from datetime import datetime
+import pytz
+
+
+def system_timezone(default='Asia/Tehran'):
+    try:
+        return str(pytz.timezone(datetime.now().astimezone().tzinfo.name))
+    except Exception:
+        return default
+
+
+def next_tick_delay(interval=1.0, now=None, lead=0.005):
+    # Seconds until just past the next wall-clock multiple of `interval`. The
+    # lead keeps a timer that fires a little early from showing the old second.
+    if now is None:
+        now = time.time()
+    return interval - now % interval + lead
+
+
+class ZoneOffsetCache:
+    def __init__(self, tz):
+        self.tz = tz
+        self.tzinfo = None
+        self.offset = None
+        self.abbreviation = None
+        self.valid_from = datetime.max
+        self.valid_until = datetime.min
+
+    def refresh(self, utc_naive):
+        local = pytz.utc.localize(utc_naive).astimezone(self.tz)
+        self.tzinfo = local.tzinfo
+        self.offset = local.utcoffset()
+        self.abbreviation = local.tzname()
+        transitions = getattr(self.tz, '_utc_transition_times', None)
+        if transitions:
+            index = bisect_right(transitions, utc_naive)
+            self.valid_from = transitions[index - 1] if index > 0 else datetime.min
+            self.valid_until = transitions[index] if index < len(transitions) else datetime.max
+        else:
+            self.valid_from = datetime.min
+            self.valid_until = datetime.max
+
+    def localize(self, utc_naive):
+        # The offset only changes at a transition, so between two of them a
+        # local time is the UTC wall time plus the cached offset.
+        if not self.valid_from <= utc_naive < self.valid_until:
+            self.refresh(utc_naive)
+        return (utc_naive + self.offset).replace(tzinfo=self.tzinfo)
+
+
+class TickService:
+    def __init__(self):
+        self.zones = {}
+        self.offsets = {}
+
+    def zone(self, name):
+        tz = self.zones.get(name)
+        if tz is None:
+            tz = self.zones[name] = pytz.timezone(name)
+        return tz
+
+    def offset_cache(self, name):
+        cache = self.offsets.get(name)
+        if cache is None:
+            cache = self.offsets[name] = ZoneOffsetCache(self.zone(name))
+        return cache
+
+    def now(self):
+        return datetime.now(pytz.utc)
+
+    def localize(self, instant, names):
+        utc_naive = instant.replace(tzinfo=None) - instant.utcoffset()
+        return [self.offset_cache(name).localize(utc_naive) for name in names]
+
+    def snapshot(self, names, instant=None):
+        if instant is None:
+            instant = self.now()
+        return instant, self.localize(instant, names)
+
+
+TIME_FORMATS = {
+    '12': '%I:%M:%S %p',
+    '24': '%H:%M:%S',
+}
+MINUTE_FORMATS = {
+    '12': '%I:%M %p',
+    '24': '%H:%M',
+}
+PRECISIONS = {
+    'seconds': 1.0,
+    'minutes': 60.0,
+}
+
+
+class ClockSnapshot:
+    """One tick of a ClockBoard, stored column-wise in zone order."""
+
+    __slots__ = ('instant', 'zones', 'local_times', 'offsets', 'abbreviations', 'formatted')
+
+    def __init__(self, instant, zones, local_times, offsets, abbreviations, formatted):
+        self.instant = instant
+        self.zones = zones
+        self.local_times = local_times
+        self.offsets = offsets
+        self.abbreviations = abbreviations
+        self.formatted = formatted
+
+    def __len__(self):
+        return len(self.zones)
+
+    def rows(self):
+        return [
+            {
+                'zone': zone,
+                'local_time': local_time.isoformat(),
+                'offset_seconds': int(offset.total_seconds()),
+                'abbreviation': abbreviation,
+                'formatted': formatted
+            }
+            for zone, local_time, offset, abbreviation, formatted in zip(
+                self.zones, self.local_times, self.offsets, self.abbreviations, self.formatted)
+        ]
+
+
+class ClockBoard:
+    """An ordered set of zones rendered with one time format.
+
+    ``snapshot`` localizes every zone for a single UTC instant. Zones that
+    share an offset and abbreviation share one formatted string, so a tick
+    costs one strftime per distinct offset rather than one per zone.
+    """
+
+    def __init__(self, zones=(), time_format='24', tick_service=None, precision='seconds'):
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision}")
+        self.tick_service = tick_service or TickService()
+        self.zones = []
+        self.precision = precision
+        self.set_format(time_format)
+        for name in zones:
+            self.add_zone(name)
+
+    def add_zone(self, name):
+        if name not in pytz.all_timezones_set:
+            raise ValueError(f"Unknown timezone: {name}")
+        if name in self.zones:
+            return False
+        self.zones.append(name)
+        return True
+
+    def remove_zone(self, name):
+        if name not in self.zones:
+            return False
+        self.zones.remove(name)
+        return True
+
+    def set_format(self, time_format):
+        self.time_format = time_format
+        formats = MINUTE_FORMATS if self.precision == 'minutes' else TIME_FORMATS
+        self.format_str = formats.get(time_format, time_format)
+
+    def set_precision(self, precision):
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision}")
+        self.precision = precision
+        self.set_format(self.time_format)
+
+    @property
+    def tick_interval(self):
+        # Seconds between changes of the rendered output.
+        return PRECISIONS[self.precision]
+
+    def snapshot(self, instant=None):
+        service = self.tick_service
+        if instant is None:
+            instant = service.now()
+        utc_naive = instant.replace(tzinfo=None) - instant.utcoffset()
+        format_str = self.format_str
+        local_times = []
+        offsets = []
+        abbreviations = []
+        formatted = []
+        strings = {}
+        for name in self.zones:
+            cache = service.offset_cache(name)
+            local_time = cache.localize(utc_naive)
+            key = (cache.offset, cache.abbreviation)
+            text = strings.get(key)
+            if text is None:
+                text = strings[key] = local_time.strftime(format_str)
+            local_times.append(local_time)
+            offsets.append(cache.offset)
+            abbreviations.append(cache.abbreviation)
+            formatted.append(text)
+        return ClockSnapshot(instant, list(self.zones), local_times, offsets, abbreviations, formatted)
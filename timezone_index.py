@@ -0,0 +1,105 @@
+from bisect import bisect_left
+from datetime import datetime
+from functools import lru_cache
+import pytz
+
+
+def normalize(text):
+    return text.strip().lower().replace('_', ' ')
+
+
+def offset_terms(offset):
+    minutes = int(offset.total_seconds() // 60)
+    sign = '-' if minutes < 0 else '+'
+    hours, minutes = divmod(abs(minutes), 60)
+    forms = [f"{sign}{hours:02d}:{minutes:02d}", f"{sign}{hours}:{minutes:02d}", f"{sign}{hours:02d}{minutes:02d}"]
+    if minutes == 0:
+        forms.append(f"{sign}{hours}")
+    return forms + ['utc' + form for form in forms] + ['gmt' + form for form in forms]
+
+
+def format_offset(offset):
+    return 'UTC' + offset_terms(offset)[0]
+
+
+class TimezoneIndex:
+    # Every searchable term (name parts, country names and codes, current
+    # abbreviation and UTC offset spellings) goes into one sorted list of
+    # (term, zone id) pairs; a query token is then a bisect range scan.
+
+    def __init__(self, instant=None):
+        self.instant = instant
+        self.zones = []
+        self.descriptions = []
+        self.terms = []
+        self.canonical = set()
+        self.built = False
+        # Per-instance cache, so rebuilding one index leaves others alone.
+        self.search = lru_cache(maxsize=256)(self._search)
+
+    def build(self):
+        instant = self.instant or datetime.now(pytz.utc)
+        countries = {}
+        for code, zones in pytz.country_timezones.items():
+            for zone in zones:
+                countries.setdefault(zone, []).append((code, pytz.country_names.get(code, code)))
+        self.canonical = set(pytz.common_timezones)
+        pairs = set()
+        for zone_id, name in enumerate(sorted(pytz.all_timezones)):
+            local = instant.astimezone(pytz.timezone(name))
+            abbreviation = local.tzname()
+            offset = local.utcoffset()
+            terms = {normalize(name)}
+            for part in name.split('/'):
+                terms.add(normalize(part))
+                terms.update(normalize(part).split())
+            for code, country in countries.get(name, []):
+                terms.add(code.lower())
+                terms.add(normalize(country))
+                terms.update(normalize(country).split())
+            if abbreviation and abbreviation[0] in '+-':
+                abbreviation = None
+            if abbreviation:
+                terms.add(abbreviation.lower())
+            terms.update(offset_terms(offset))
+            pairs.update((term, zone_id) for term in terms if term)
+            country_text = ', '.join(country for _, country in countries.get(name, []))
+            details = ', '.join(filter(None, [country_text, abbreviation, format_offset(offset)]))
+            self.zones.append(name)
+            self.descriptions.append(f"{name} ({details})")
+        self.terms = sorted(pairs)
+        self.term_keys = [term for term, _ in self.terms]
+        self.built = True
+        self.search.cache_clear()
+
+    def ensure_built(self):
+        if not self.built:
+            self.build()
+
+    def matches(self, token):
+        start = bisect_left(self.term_keys, token)
+        found = set()
+        for term, zone_id in self.terms[start:]:
+            if not term.startswith(token):
+                break
+            found.add(zone_id)
+        return found
+
+    def _search(self, query, limit=50):
+        self.ensure_built()
+        tokens = normalize(query).split()
+        if not tokens:
+            return []
+        found = None
+        for token in sorted(tokens, key=len, reverse=True):
+            ids = self.matches(token)
+            found = ids if found is None else found & ids
+            if not found:
+                return []
+        exact = normalize(query)
+        ranked = sorted(found, key=lambda zone_id: (
+            self.zones[zone_id] not in self.canonical,
+            normalize(self.zones[zone_id]) != exact,
+            self.zones[zone_id]
+        ))
+        return [(self.zones[zone_id], self.descriptions[zone_id]) for zone_id in ranked[:limit]]